@@ -1,10 +1,26 @@
 """WebSocket client for real-time game data streaming."""
 
 import asyncio
-import json
 import logging
 import time
-from typing import Callable, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, List, Optional, Tuple, Union
+
+try:
+    import orjson as json_impl
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    import json as json_impl  # type: ignore[no-redef]
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - required dependency, checked in connect()
+    websockets = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack is an optional speedup
+    msgpack = None
 
 from ..models.factory_state import FactoryState
 
@@ -17,6 +33,7 @@ class RealTimeStream:
 
     Features:
     - Automatic reconnection with exponential backoff
+    - Warm standby connection promoted on disconnect
     - Connection health monitoring
     - Latency tracking
     - Graceful degradation
@@ -29,6 +46,25 @@ class RealTimeStream:
     MAX_RECONNECT_ATTEMPTS = 10
     PING_INTERVAL = 10.0  # seconds
     PING_TIMEOUT = 5.0  # seconds
+    CONNECT_TIMEOUT = 10.0  # seconds
+
+    # Connection buffer tuning (override per deployment if needed)
+    MAX_MESSAGE_SIZE = 16 * 1024 * 1024  # bytes; large factories exceed the 1 MiB default
+    MAX_QUEUE = 32  # frames buffered by websockets before applying backpressure
+    WRITE_LIMIT = 1 << 20  # bytes
+    COMPRESSION: Optional[str] = None  # permessage-deflate costs CPU on every frame
+
+    # Connections kept open: the active one plus warm standbys
+    POOL_SIZE = 2
+
+    # Minimum spacing between state callbacks; faster ticks are coalesced
+    CALLBACK_MIN_INTERVAL_MS = 50
+
+    # Sent to the plugin when a delta frame is missed
+    RESYNC_REQUEST = '{"type": "resync"}'
+
+    # Wire formats offered to the plugin, most compact first
+    SUBPROTOCOLS = ("msgpack", "json") if msgpack is not None else ("json",)
 
     def __init__(self, host: str = "localhost", port: int = 8470) -> None:
         self.host = host
@@ -37,27 +73,140 @@ class RealTimeStream:
         self.websocket: Optional[object] = None
         self.latest_state: Optional[FactoryState] = None
         self._receive_task: Optional[asyncio.Task[None]] = None
-        self._reconnect_task: Optional[asyncio.Task[None]] = None
+        self._supervisor_task: Optional[asyncio.Task[None]] = None
         self._connected = False
         self._should_reconnect = True
         self._reconnect_attempts = 0
         self._current_reconnect_delay = self.INITIAL_RECONNECT_DELAY
-        self._last_message_time: float = 0
-        self._last_latency_ms: float = 0
+        self._last_message_time: float = 0  # time.monotonic() of last update
+        self._last_game_timestamp: Optional[float] = None  # unix time sent by the plugin
         self._on_state_update: Optional[Callable[[FactoryState], None]] = None
+        self._last_callback_time: float = 0
+        # Decoded planets section of the last full frame, for change detection
+        self._last_planets_data: Optional[dict] = None
+        # Sequence number of the last applied frame, for delta gap detection
+        self._last_seq: Optional[int] = None
+        self._resync_requested = False
         self._connection_lock = asyncio.Lock()
+        # Warm standby connections and the tasks draining them
+        self._standby: List[Tuple[Any, asyncio.Task[None]]] = []
+        self._standby_task: Optional[asyncio.Task[None]] = None
+        # Unprocessed (receive time, frame) pairs, oldest first
+        self._pending: Deque[Tuple[float, Union[str, bytes]]] = deque()
+        self._pending_event = asyncio.Event()
+        self._dropped_frames = 0
+        self._receive_done = False
+        self._parse_executor: Optional[ThreadPoolExecutor] = None
+        # Set by the receive loop when the active connection drops
+        self._disconnect_event = asyncio.Event()
+        # Pulsed on every state update to wake waiters without polling
+        self._state_event = asyncio.Event()
+
+    async def set_address(self, host: str, port: int) -> bool:
+        """
+        Point the stream at a new game address.
+
+        When the address changes, the active connection and any warm
+        standbys (all opened to the old address) are closed and the state
+        received from the old game is discarded, so the next connect() or
+        reconnect goes to the new address.
+
+        Args:
+            host: Game host address
+            port: WebSocket port
+
+        Returns:
+            True if the address changed
+        """
+        if host == self.host and port == self.port:
+            return False
+
+        async with self._connection_lock:
+            self.host = host
+            self.port = port
+            self.uri = f"ws://{host}:{port}"
+            await self._drop_connections()
+
+            # A frame from the old game may still be parsing; resetting on the
+            # single-thread parse executor orders the reset after it
+            if self._parse_executor is None:
+                self._reset_parse_state()
+            else:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._parse_executor, self._reset_parse_state
+                )
+
+        self.latest_state = None
+        self._last_message_time = 0
+        self._last_game_timestamp = None
+        return True
+
+    def _reset_parse_state(self) -> None:
+        """Forget the frame history used to apply deltas. Runs in the parse executor."""
+        self._last_seq = None
+        self._last_planets_data = None
+
+    async def _drop_connections(self) -> None:
+        """Close the active connection and all standbys, keeping the supervisor."""
+        if self._standby_task:
+            self._standby_task.cancel()
+            self._standby_task = None
+
+        for websocket, drain_task in self._standby:
+            drain_task.cancel()
+            try:
+                await websocket.close()
+            except Exception:
+                pass
+        self._standby.clear()
+
+        if self._receive_task:
+            self._receive_task.cancel()
+            try:
+                await self._receive_task
+            except asyncio.CancelledError:
+                pass
+            self._receive_task = None
+
+        if self.websocket:
+            try:
+                await self.websocket.close()  # type: ignore
+            except Exception:
+                pass
+            self.websocket = None
+
+        self._connected = False
 
     @property
     def latency_ms(self) -> float:
-        """Get estimated latency in milliseconds."""
-        return self._last_latency_ms
+        """
+        Get estimated latency in milliseconds.
+
+        Uses the round-trip time of the last WebSocket keepalive ping. Before
+        the first pong, falls back to the delay between the game's frame
+        timestamp and its arrival, which depends on both clocks agreeing.
+        """
+        ping_latency = getattr(self.websocket, "latency", 0.0)
+        if ping_latency and ping_latency == ping_latency:  # skip 0 and NaN
+            return ping_latency * 1000
+
+        if self._last_game_timestamp is None or self._last_message_time == 0:
+            return 0.0
+
+        # Convert the monotonic receive time of the last frame to wall time
+        receive_wall_time = time.time() - (time.monotonic() - self._last_message_time)
+        return (receive_wall_time - self._last_game_timestamp) * 1000
 
     @property
     def last_update_age_ms(self) -> float:
         """Get milliseconds since last update."""
+        return self._update_age_ms(time.monotonic())
+
+    def _update_age_ms(self, now: float) -> float:
+        """Get milliseconds between the last update and a time.monotonic() reading."""
         if self._last_message_time == 0:
             return float('inf')
-        return (time.time() - self._last_message_time) * 1000
+        return (now - self._last_message_time) * 1000
 
     def set_state_callback(self, callback: Callable[[FactoryState], None]) -> None:
         """Set callback to be called on each state update."""
@@ -69,37 +218,27 @@ class RealTimeStream:
 
         Returns:
             True if connection successful, False otherwise
+
+        Raises:
+            RuntimeError: If the websockets package is not installed
         """
+        if websockets is None:
+            raise RuntimeError("websockets is required for real-time streaming")
+
         async with self._connection_lock:
             if self._connected:
                 return True
 
             try:
-                import websockets
-
                 logger.info(f"Connecting to game at {self.uri}...")
-                connect_start = time.time()
-
-                self.websocket = await asyncio.wait_for(
-                    websockets.connect(
-                        self.uri,
-                        ping_interval=self.PING_INTERVAL,
-                        ping_timeout=self.PING_TIMEOUT,
-                        close_timeout=5.0,
-                    ),
-                    timeout=10.0
-                )
-
-                connect_time = (time.time() - connect_start) * 1000
-                logger.info(f"Connected to game at {self.uri} ({connect_time:.0f}ms)")
+                connect_start = time.monotonic()
 
-                self._connected = True
-                self._reconnect_attempts = 0
-                self._current_reconnect_delay = self.INITIAL_RECONNECT_DELAY
+                websocket = await self._open_connection()
 
-                # Start receive loop
-                self._receive_task = asyncio.create_task(self._receive_loop())
+                connect_time = (time.monotonic() - connect_start) * 1000
+                logger.info(f"Connected to game at {self.uri} ({connect_time:.0f}ms)")
 
+                self._activate(websocket)
                 return True
 
             except asyncio.TimeoutError:
@@ -111,89 +250,410 @@ class RealTimeStream:
                 self._connected = False
                 return False
 
-    async def _receive_loop(self) -> None:
-        """Continuously receive and process game data."""
+    async def _open_connection(self) -> Any:
+        """Open a new WebSocket connection to the game plugin."""
+        return await asyncio.wait_for(
+            websockets.connect(
+                self.uri,
+                ping_interval=self.PING_INTERVAL,
+                ping_timeout=self.PING_TIMEOUT,
+                close_timeout=5.0,
+                subprotocols=list(self.SUBPROTOCOLS),
+                max_size=self.MAX_MESSAGE_SIZE,
+                max_queue=self.MAX_QUEUE,
+                write_limit=self.WRITE_LIMIT,
+                compression=self.COMPRESSION,
+            ),
+            timeout=self.CONNECT_TIMEOUT
+        )
+
+    def _activate(self, websocket: Any) -> None:
+        """Make a connection the active one and start receiving from it."""
+        self.websocket = websocket
+        self._connected = True
+        self._reconnect_attempts = 0
+        self._current_reconnect_delay = self.INITIAL_RECONNECT_DELAY
+
+        # Start receive loop
+        self._receive_task = asyncio.create_task(self._receive_loop())
+
+        # Top up the standby pool in the background
+        self._fill_standby_pool()
+
+        self._ensure_supervisor()
+
+    def _fill_standby_pool(self) -> None:
+        """Open standby connections in the background up to POOL_SIZE - 1."""
+        if self._standby_task is None or self._standby_task.done():
+            self._standby_task = asyncio.create_task(self._open_standbys())
+
+    async def _open_standbys(self) -> None:
+        """Open standby connections until the pool is full."""
+        while self._should_reconnect and len(self._standby) < self.POOL_SIZE - 1:
+            try:
+                websocket = await self._open_connection()
+            except Exception as e:
+                logger.debug(f"Could not open standby connection: {e}")
+                return
+
+            entry = (websocket, asyncio.create_task(self._drain_standby(websocket)))
+            self._standby.append(entry)
+            logger.debug(f"Standby connection ready ({len(self._standby)} warm)")
+
+    async def _drain_standby(self, websocket: Any) -> None:
+        """
+        Discard frames on a standby connection.
+
+        The plugin broadcasts to every client, so an unread standby would
+        eventually fill its socket buffer and block the plugin's sender.
+        """
         try:
-            import websockets
+            async for _ in websocket:
+                pass
+        except Exception:
+            pass
+        finally:
+            self._standby = [entry for entry in self._standby if entry[0] is not websocket]
 
-            async for message in self.websocket:  # type: ignore
-                receive_time = time.time()
+    async def _promote_standby(self) -> bool:
+        """
+        Replace the dropped connection with a warm standby.
 
+        Returns:
+            True if a standby was promoted, False if none was usable
+        """
+        async with self._connection_lock:
+            if self._connected:
+                return True
+
+            while self._standby:
+                websocket, drain_task = self._standby.pop(0)
+                if drain_task.done():
+                    # Standby closed while idle
+                    continue
+
+                drain_task.cancel()
                 try:
-                    data = json.loads(message)
+                    await drain_task
+                except asyncio.CancelledError:
+                    pass
+
+                logger.info(f"Promoted standby connection to {self.uri}")
+                self._activate(websocket)
+                return True
+
+            return False
+
+    @staticmethod
+    def _decode_message(message: Union[str, bytes]) -> Any:
+        """
+        Decode a single WebSocket frame.
+
+        Binary frames carry msgpack, text frames carry JSON.
+        """
+        if msgpack is not None and isinstance(message, (bytes, bytearray)):
+            return msgpack.unpackb(message, raw=False, use_list=False)
+        return json_impl.loads(message)
+
+    def _get_parse_executor(self) -> ThreadPoolExecutor:
+        """Get the single-thread executor used for decoding frames."""
+        if self._parse_executor is None:
+            self._parse_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="dsp-realtime-parse"
+            )
+        return self._parse_executor
+
+    def _parse_messages(
+        self, messages: List[Union[str, bytes]]
+    ) -> Optional[Tuple[Any, FactoryState, int]]:
+        """
+        Decode a backlog of frames and build the newest FactoryState.
+
+        Runs in the parse executor. A full snapshot supersedes every frame
+        received before it, so the backlog is decoded newest first back to
+        the last full frame and older frames are skipped. That frame and the
+        deltas after it are then applied in order, so no delta is lost
+        while parsing falls behind. Every planet is built here, so a
+        malformed frame fails before anything is published.
+
+        Returns:
+            Tuple of (decoded data of the newest frame, new FactoryState,
+            number of superseded frames skipped), or None if a delta could
+            not be applied and a full resync is needed
+        """
+        frames: List[Any] = []
+        for message in reversed(messages):
+            data = self._decode_message(message)
+            frames.append(data)
+            if data.get("type") != "delta":
+                break
+        frames.reverse()
+
+        state = self.latest_state
+        last_seq = self._last_seq
+        last_planets_data = self._last_planets_data
+        for data in frames:
+            seq = data.get("seq")
+            if data.get("type") == "delta":
+                # A missed delta (or one without a base state) means our state is wrong
+                if state is None or last_seq is None or seq != last_seq + 1:
+                    return None
+                state = FactoryState.apply_delta(state, data)
+                last_planets_data = None
+            else:
+                planets_data = data.get("planets", data.get("Planets")) or {}
+                state = self._build_full_state(data, planets_data, state, last_planets_data)
+                last_planets_data = planets_data
+            last_seq = seq
+
+        # Only record progress once every frame has been applied
+        if frames[0].get("type") != "delta":
+            self._resync_requested = False
+        self._last_seq = last_seq
+        self._last_planets_data = last_planets_data
+        return frames[-1], state, len(messages) - len(frames)  # type: ignore[return-value]
+
+    @staticmethod
+    def _build_full_state(
+        data: Any,
+        planets_data: dict,
+        previous: Optional[FactoryState],
+        last_planets_data: Optional[dict],
+    ) -> FactoryState:
+        """
+        Build the FactoryState for a full frame.
 
-                    # Calculate approximate latency from game timestamp
-                    if "timestamp" in data:
-                        game_timestamp = data["timestamp"]
-                        self._last_latency_ms = (receive_time - game_timestamp) * 1000
+        Only planets whose data changed since the previous full frame are
+        rebuilt (timestamp/gameTick change every frame, so the decoded planets
+        are compared rather than the raw message). Comparing a planet costs a
+        small fraction of building it.
+        """
+        if previous is None or last_planets_data is None:
+            return FactoryState.from_realtime_data(data)
 
-                    # Parse into FactoryState
-                    self.latest_state = FactoryState.from_realtime_data(data)
-                    self._last_message_time = receive_time
+        changed = {
+            int(planet_id)
+            for planet_id, planet_data in planets_data.items()
+            if last_planets_data.get(planet_id) != planet_data
+        }
+        state = FactoryState.from_realtime_data(data, planet_ids=changed)
+        built = state.planets
+        state.planets = {
+            planet_id: built[planet_id] if planet_id in changed else previous.planets[planet_id]
+            for planet_id in map(int, planets_data)
+        }
+        return state
 
-                    # Notify callback if set
-                    if self._on_state_update:
-                        try:
-                            self._on_state_update(self.latest_state)
-                        except Exception as e:
-                            logger.warning(f"State callback error: {e}")
+    async def _receive_loop(self) -> None:
+        """
+        Continuously receive game data.
 
-                    logger.debug(f"Received state update: {len(message)} bytes, "
-                               f"latency: {self._last_latency_ms:.0f}ms")
+        Frames are queued in arrival order for _process_messages, which
+        parses whatever backlog has built up in one batch.
+        """
+        self._pending.clear()
+        self._receive_done = False
+        processor = asyncio.create_task(self._process_messages())
+        cancelled = False
 
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON in message: {e}")
+        # Bind hot-loop lookups once
+        pending = self._pending
+        wake_processor = self._pending_event.set
+        monotonic = time.monotonic
+
+        try:
+            async for message in self.websocket:  # type: ignore
+                pending.append((monotonic(), message))
+                wake_processor()
 
         except asyncio.CancelledError:
+            cancelled = True
             logger.debug("Receive loop cancelled")
         except Exception as e:
             logger.info(f"WebSocket connection closed: {e}")
         finally:
+            # Let the processor finish the queued frames, unless shutting down
+            self._receive_done = True
+            self._pending_event.set()
+            if cancelled:
+                processor.cancel()
+            try:
+                await processor
+            except asyncio.CancelledError:
+                pass
+
             self._connected = False
 
-            # Schedule reconnection if enabled
-            if self._should_reconnect:
-                asyncio.create_task(self._schedule_reconnect())
+            # Wake the supervisor to reconnect
+            self._disconnect_event.set()
+
+    async def _process_messages(self) -> None:
+        """Process queued frames until the receive loop finishes."""
+        while True:
+            await self._pending_event.wait()
+            self._pending_event.clear()
+
+            while self._pending:
+                backlog = list(self._pending)
+                self._pending.clear()
+                await self._process_backlog(backlog)
+
+            if self._receive_done:
+                return
+
+    async def _process_backlog(
+        self, backlog: List[Tuple[float, Union[str, bytes]]]
+    ) -> None:
+        """Parse queued frames off the event loop and publish the resulting state."""
+        receive_time = backlog[-1][0]
+        messages = [message for _, message in backlog]
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_parse_executor(), self._parse_messages, messages
+            )
+        except ValueError as e:
+            # JSON and msgpack decode errors are both ValueError subclasses
+            logger.warning(f"Invalid payload in message: {e}")
+            return
+        except Exception as e:
+            logger.warning(f"Could not build state from message: {e}")
+            return
+
+        if result is None:
+            await self._request_resync()
+            return
+        data, state, skipped = result
+        self._dropped_frames += skipped
+
+        # Keep the game timestamp for the latency fallback
+        if "timestamp" in data:
+            self._last_game_timestamp = data["timestamp"]
+
+        self.latest_state = state
+        self._last_message_time = receive_time
+
+        # Wake anyone waiting for a new state
+        self._state_event.set()
+        self._state_event.clear()
+
+        # Notify callback if set, at most once per CALLBACK_MIN_INTERVAL_MS
+        if (
+            self._on_state_update
+            and (receive_time - self._last_callback_time) * 1000
+            >= self.CALLBACK_MIN_INTERVAL_MS
+        ):
+            self._last_callback_time = receive_time
+            try:
+                self._on_state_update(self.latest_state)  # type: ignore[arg-type]
+            except Exception as e:
+                logger.warning(f"State callback error: {e}")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received state update: {len(messages)} frame(s)")
 
-    async def _schedule_reconnect(self) -> None:
-        """Schedule a reconnection attempt with exponential backoff."""
-        if self._reconnect_attempts >= self.MAX_RECONNECT_ATTEMPTS:
-            logger.warning(f"Max reconnection attempts ({self.MAX_RECONNECT_ATTEMPTS}) reached")
+    async def _request_resync(self) -> None:
+        """Ask the plugin for a full snapshot after a missed delta frame."""
+        if self._resync_requested:
             return
+        self._resync_requested = True
+        logger.info("Missed delta frame, requesting full resync")
+        try:
+            await self.websocket.send(self.RESYNC_REQUEST)  # type: ignore
+        except Exception as e:
+            logger.debug(f"Could not send resync request: {e}")
+
+    def _ensure_supervisor(self) -> None:
+        """Start the reconnection supervisor if it is not already running."""
+        if self._supervisor_task is None or self._supervisor_task.done():
+            self._supervisor_task = asyncio.create_task(self._supervisor())
 
-        self._reconnect_attempts += 1
-        delay = min(self._current_reconnect_delay, self.MAX_RECONNECT_DELAY)
+    async def _supervisor(self) -> None:
+        """
+        Reconnect after each disconnect, for the lifetime of the stream.
+
+        A single long-lived task owns the backoff state: it waits for the
+        receive loop to report a disconnect, promotes a warm standby if one
+        is available, and otherwise retries with exponential backoff.
+        """
+        while self._should_reconnect:
+            await self._disconnect_event.wait()
+            self._disconnect_event.clear()
 
-        logger.info(f"Reconnecting in {delay:.1f}s (attempt {self._reconnect_attempts}/"
-                   f"{self.MAX_RECONNECT_ATTEMPTS})")
+            if not self._should_reconnect or self._connected:
+                continue
 
-        await asyncio.sleep(delay)
-        self._current_reconnect_delay *= self.RECONNECT_BACKOFF_FACTOR
+            if self._standby and await self._promote_standby():
+                continue
 
-        if self._should_reconnect and not self._connected:
-            success = await self.connect()
-            if not success and self._should_reconnect:
-                await self._schedule_reconnect()
+            while self._should_reconnect and not self._connected:
+                if self._reconnect_attempts >= self.MAX_RECONNECT_ATTEMPTS:
+                    logger.warning(
+                        f"Max reconnection attempts ({self.MAX_RECONNECT_ATTEMPTS}) reached"
+                    )
+                    return
 
-    def is_connected(self) -> bool:
-        """Check if WebSocket connection is active and receiving data."""
+                self._reconnect_attempts += 1
+                delay = min(self._current_reconnect_delay, self.MAX_RECONNECT_DELAY)
+
+                logger.info(f"Reconnecting in {delay:.1f}s (attempt {self._reconnect_attempts}/"
+                           f"{self.MAX_RECONNECT_ATTEMPTS})")
+
+                await asyncio.sleep(delay)
+                self._current_reconnect_delay *= self.RECONNECT_BACKOFF_FACTOR
+
+                if self._should_reconnect and not self._connected:
+                    await self.connect()
+
+    def is_connected(self, now: Optional[float] = None) -> bool:
+        """
+        Check if WebSocket connection is active and receiving data.
+
+        Args:
+            now: time.monotonic() reading to reuse across several checks
+        """
         if not self._connected:
             return False
 
         # Consider stale if no data in last 5 seconds
-        if self.last_update_age_ms > 5000:
+        if self._update_age_ms(time.monotonic() if now is None else now) > 5000:
             return False
 
         return True
 
-    def is_healthy(self) -> bool:
-        """Check if connection is healthy (connected with recent data and low latency)."""
+    def is_healthy(self, now: Optional[float] = None) -> bool:
+        """
+        Check if connection is healthy (connected with recent data and low latency).
+
+        Args:
+            now: time.monotonic() reading to reuse across several checks
+        """
+        if not self._connected:
+            return False
+
+        age_ms = self._update_age_ms(time.monotonic() if now is None else now)
         return (
-            self.is_connected() and
-            self.last_update_age_ms < 2000 and  # Fresh data (< 2s old)
-            self._last_latency_ms < 500  # Low latency (< 500ms)
+            age_ms < 2000 and  # Fresh data (< 2s old)
+            self.latency_ms < 500  # Low latency (< 500ms)
         )
 
+    async def _ensure_connected(self, timeout: float) -> None:
+        """
+        Connect if not already connected, giving up after timeout seconds.
+
+        Raises:
+            ConnectionError: If the connection fails or takes longer than timeout
+        """
+        if self._connected:
+            return
+
+        try:
+            connected = await asyncio.wait_for(self.connect(), timeout=timeout)
+        except asyncio.TimeoutError:
+            connected = False
+        if not connected:
+            raise ConnectionError(f"Cannot connect to game at {self.uri}")
+
     async def get_current_state(self, timeout: float = 5.0) -> FactoryState:
         """
         Get most recent factory state from stream.
@@ -208,23 +668,23 @@ class RealTimeStream:
             ConnectionError: If cannot connect to game
             TimeoutError: If no data received within timeout
         """
+        # One deadline covers both connecting and waiting for data
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
         # Attempt connection if not connected
-        if not self._connected:
-            if not await self.connect():
-                raise ConnectionError(f"Cannot connect to game at {self.uri}")
+        await self._ensure_connected(timeout)
 
         # Wait for at least one state update
-        elapsed = 0.0
-        poll_interval = 0.1
-
-        while self.latest_state is None and elapsed < timeout:
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-
         if self.latest_state is None:
-            raise TimeoutError(f"No data received from game within {timeout}s")
+            try:
+                await asyncio.wait_for(
+                    self._state_event.wait(), timeout=max(0.0, deadline - loop.time())
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"No data received from game within {timeout}s") from None
 
-        return self.latest_state
+        return self.latest_state  # type: ignore[return-value]
 
     async def wait_for_fresh_state(self, max_age_ms: float = 1000, timeout: float = 5.0) -> FactoryState:
         """
@@ -237,30 +697,43 @@ class RealTimeStream:
         Returns:
             FactoryState with data newer than max_age_ms
         """
-        if not self._connected:
-            if not await self.connect():
-                raise ConnectionError(f"Cannot connect to game at {self.uri}")
+        # One deadline covers both connecting and waiting for data
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
 
-        elapsed = 0.0
-        poll_interval = 0.05  # 50ms polling for fresh data
+        await self._ensure_connected(timeout)
 
-        while elapsed < timeout:
+        while True:
             if self.latest_state and self.last_update_age_ms < max_age_ms:
                 return self.latest_state
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._state_event.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
 
         raise TimeoutError(f"No fresh data (< {max_age_ms}ms old) within {timeout}s")
 
-    def get_connection_status(self) -> dict:
-        """Get detailed connection status for diagnostics."""
+    def get_connection_status(self, now: Optional[float] = None) -> dict:
+        """
+        Get detailed connection status for diagnostics.
+
+        Args:
+            now: time.monotonic() reading to reuse across several checks
+        """
+        if now is None:
+            now = time.monotonic()
         return {
             "connected": self._connected,
-            "healthy": self.is_healthy(),
+            "healthy": self.is_healthy(now),
             "uri": self.uri,
-            "latency_ms": self._last_latency_ms if self._connected else None,
-            "last_update_age_ms": self.last_update_age_ms if self._last_message_time > 0 else None,
+            "latency_ms": self.latency_ms if self._connected else None,
+            "last_update_age_ms": self._update_age_ms(now) if self._last_message_time > 0 else None,
             "reconnect_attempts": self._reconnect_attempts,
+            "dropped_frames": self._dropped_frames,
             "has_data": self.latest_state is not None,
         }
 
@@ -268,20 +741,19 @@ class RealTimeStream:
         """Close WebSocket connection and stop reconnection."""
         self._should_reconnect = False
 
-        if self._receive_task:
-            self._receive_task.cancel()
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
             try:
-                await self._receive_task
+                await self._supervisor_task
             except asyncio.CancelledError:
                 pass
 
-        if self.websocket:
-            try:
-                await self.websocket.close()  # type: ignore
-            except Exception:
-                pass
+        await self._drop_connections()
+
+        if self._parse_executor:
+            self._parse_executor.shutdown(wait=False)
+            self._parse_executor = None
 
-        self._connected = False
         logger.info("WebSocket connection closed")
 
     async def __aenter__(self) -> "RealTimeStream":
@@ -2,8 +2,9 @@
 
 import asyncio
 import logging
+import time
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .realtime_stream import RealTimeStream
 from .save_parser import SaveFileParser
@@ -33,6 +34,9 @@ class DataSourceRouter:
     # Latency threshold for considering real-time "healthy"
     MAX_ACCEPTABLE_LATENCY_MS = 200
 
+    # How long get_status() results are reused
+    STATUS_TTL = 0.5  # seconds
+
     def __init__(
         self,
         realtime_host: str = "localhost",
@@ -51,13 +55,18 @@ class DataSourceRouter:
         self.save_parser = SaveFileParser()
         self.auto_fallback = auto_fallback
         self._preferred_mode: Optional[DataSourceMode] = None
-        self._last_realtime_attempt: float = 0
+        self._last_realtime_attempt: float = float("-inf")  # time.monotonic() of last attempt
         self._realtime_attempt_interval: float = 30.0  # Retry real-time every 30s
+        self._status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
 
     @property
     def current_mode(self) -> DataSourceMode:
         """Get the current data source mode."""
-        if self.realtime_stream.is_connected():
+        return self._current_mode(self.realtime_stream.is_connected())
+
+    def _current_mode(self, realtime_connected: bool) -> DataSourceMode:
+        """Get the current data source mode given the real-time connection state."""
+        if realtime_connected:
             return DataSourceMode.REALTIME
         elif self.save_parser.save_dir is not None:
             return DataSourceMode.SAVE_FILE
@@ -82,6 +91,7 @@ class DataSourceRouter:
             mode: Preferred mode (REALTIME or SAVE_FILE)
         """
         self._preferred_mode = mode
+        self._status_cache = None
         logger.info(f"Preferred data source mode set to: {mode.value}")
 
     async def connect_realtime(self) -> bool:
@@ -91,8 +101,8 @@ class DataSourceRouter:
         Returns:
             True if connection successful
         """
-        import time
-        self._last_realtime_attempt = time.time()
+        self._last_realtime_attempt = time.monotonic()
+        self._status_cache = None
         return await self.realtime_stream.connect()
 
     async def get_factory_state(
@@ -121,8 +131,6 @@ class DataSourceRouter:
         Raises:
             ConnectionError: If no data source is available
         """
-        import time
-
         # Determine which mode to use
         mode = force_mode or self._preferred_mode or self._select_best_mode()
 
@@ -146,7 +154,7 @@ class DataSourceRouter:
 
         else:
             # Try to connect to real-time if we haven't tried recently
-            if time.time() - self._last_realtime_attempt > self._realtime_attempt_interval:
+            if time.monotonic() - self._last_realtime_attempt > self._realtime_attempt_interval:
                 if await self.connect_realtime():
                     return await self.realtime_stream.get_current_state()
 
@@ -178,37 +186,60 @@ class DataSourceRouter:
     async def get_factory_state_with_source(
         self,
         force_mode: Optional[DataSourceMode] = None,
+        require_fresh: bool = False,
+        max_age_ms: float = 1000,
     ) -> tuple[FactoryState, DataSourceMode]:
         """
         Get factory state along with the source mode used.
 
+        Args:
+            force_mode: Force specific data source
+            require_fresh: Require fresh real-time data (blocks until fresh)
+            max_age_ms: Maximum age for "fresh" data
+
         Returns:
             Tuple of (FactoryState, DataSourceMode)
         """
-        state = await self.get_factory_state(force_mode=force_mode)
+        state = await self.get_factory_state(
+            force_mode=force_mode,
+            require_fresh=require_fresh,
+            max_age_ms=max_age_ms,
+        )
         return state, self.current_mode
 
     def get_status(self) -> Dict[str, Any]:
         """
         Get comprehensive status of all data sources.
 
+        Results are reused for STATUS_TTL seconds so frequent polling does
+        not rescan the save directory.
+
         Returns:
             Status dictionary with connection info
         """
-        return {
-            "current_mode": self.current_mode.value,
+        # Take one clock reading for all freshness checks
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < self.STATUS_TTL:
+            return self._status_cache[1]
+
+        realtime_connected = self.realtime_stream.is_connected(now)
+
+        status = {
+            "current_mode": self._current_mode(realtime_connected).value,
             "preferred_mode": self._preferred_mode.value if self._preferred_mode else None,
             "auto_fallback": self.auto_fallback,
             "realtime": {
-                "available": self.is_realtime_available,
-                **self.realtime_stream.get_connection_status(),
+                "available": realtime_connected,
+                **self.realtime_stream.get_connection_status(now),
             },
             "save_file": {
                 "available": self.is_save_file_available,
                 "save_dir": str(self.save_parser.save_dir) if self.save_parser.save_dir else None,
-                "save_files": len(self.save_parser.list_save_files()),
+                "save_files": self.save_parser.count_save_files(),
             },
         }
+        self._status_cache = (now, status)
+        return status
 
     async def close(self) -> None:
         """Close all data source connections."""
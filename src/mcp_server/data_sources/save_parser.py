@@ -1,9 +1,15 @@
 """Parse DSP .dsv save files for offline analysis."""
 
+import asyncio
 import logging
+import os
+import struct
 import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 
 # Add vendor directory to path for dsp_save_parser
 _vendor_path = Path(__file__).parent.parent / "vendor"
@@ -15,8 +21,13 @@ from ..models.factory_state import FactoryState
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def _import_game_save() -> Any:
-    """Lazy import of GameSave to avoid import errors if library unavailable."""
+    """Lazy import of GameSave to avoid import errors if library unavailable.
+
+    Cached so every parser instance shares one import; failures are not
+    cached and are retried on the next call.
+    """
     try:
         from dsp_save_parser import GameSave
         return GameSave
@@ -31,34 +42,79 @@ def _import_game_save() -> Any:
 class SaveFileParser:
     """Parse DSP .dsv save files for offline analysis."""
 
+    # Every save starts with this header (VFSaveHeader in save_format.txt)
+    SAVE_MAGIC = b"VFSAVE"
+
+    # Leading GameSave fields: magic, then the total file length (int64)
+    SAVE_HEADER = struct.Struct("<6sq")
+
+    # Read buffer for save files (saves are typically tens of MB)
+    READ_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+    # Number of parsed saves kept in memory
+    CACHE_SIZE = 4
+
+    # How long a directory scan is reused before rescanning
+    LIST_TTL_MS = 1000
+
+    # How long an auto-detected save directory is reused by new parsers
+    DETECT_TTL = 60.0  # seconds
+
+    # (time.monotonic() of detection, detected directory), shared by all instances
+    _detected: ClassVar[Optional[Tuple[float, Optional[Path]]]] = None
+
     def __init__(self, auto_detect_path: bool = True) -> None:
         self.save_dir: Optional[Path] = None
         self._game_save_class: Optional[Any] = None
+        # (path, mtime_ns, size) -> FactoryState, least recently used first
+        self._cache: "OrderedDict[Tuple[str, int, int], FactoryState]" = OrderedDict()
+        # (scan time, scanned directory, .dsv entries with cached stat)
+        self._scan_cache: Optional[Tuple[float, Path, List[os.DirEntry]]] = None
+        # Parses currently running, so concurrent callers share one parse
+        self._inflight: Dict[Tuple[str, int, int], "asyncio.Task[FactoryState]"] = {}
+        # (scanned directory, directory st_mtime_ns, .dsv file count)
+        self._count_cache: Optional[Tuple[Path, int, int]] = None
+        # (scan it was built from, sorted listing)
+        self._list_cache: Optional[Tuple[List[os.DirEntry], List[Dict[str, Any]]]] = None
         if auto_detect_path:
             self._detect_save_directory()
 
     def _detect_save_directory(self) -> None:
         """Auto-detect DSP save directory."""
-        # Windows: %USERPROFILE%\Documents\Dyson Sphere Program\Save
+        now = time.monotonic()
+        detected = SaveFileParser._detected
+        if detected is not None and now - detected[0] < self.DETECT_TTL:
+            self.save_dir = detected[1]
+            return
+
+        for candidate in self._save_dir_candidates():
+            if candidate.exists():
+                self.save_dir = candidate
+                logger.info(f"Found save directory: {candidate}")
+                break
+        else:
+            logger.warning("DSP save directory not found")
+
+        SaveFileParser._detected = (now, self.save_dir)
+
+    @staticmethod
+    def _save_dir_candidates() -> List[Path]:
+        """Get possible save directories for the current platform."""
+        if sys.platform.startswith("win"):
+            # Windows: %USERPROFILE%\Documents\Dyson Sphere Program\Save
+            profile = os.environ.get("USERPROFILE")
+            home = Path(profile) if profile else Path.home()
+            return [home / "Documents" / "Dyson Sphere Program" / "Save"]
+
         # Linux: ~/.config/unity3d/Youthcat Studio/Dyson Sphere Program/Save
-        windows_path = Path.home() / "Documents" / "Dyson Sphere Program" / "Save"
-        linux_path = (
+        return [
             Path.home()
             / ".config"
             / "unity3d"
             / "Youthcat Studio"
             / "Dyson Sphere Program"
             / "Save"
-        )
-
-        if windows_path.exists():
-            self.save_dir = windows_path
-            logger.info(f"Found save directory: {windows_path}")
-        elif linux_path.exists():
-            self.save_dir = linux_path
-            logger.info(f"Found save directory: {linux_path}")
-        else:
-            logger.warning("DSP save directory not found")
+        ]
 
     def _get_game_save_class(self) -> Any:
         """Get GameSave class, importing lazily."""
@@ -66,6 +122,54 @@ class SaveFileParser:
             self._game_save_class = _import_game_save()
         return self._game_save_class
 
+    def invalidate_cache(self) -> None:
+        """Drop all cached parse results and directory scans."""
+        self._cache.clear()
+        self._scan_cache = None
+        self._count_cache = None
+        self._list_cache = None
+
+    def _scan_save_files(self) -> List[os.DirEntry]:
+        """
+        Scan the save directory for .dsv files.
+
+        Uses os.scandir so each entry carries its own cached stat, and reuses
+        the scan for LIST_TTL_MS to absorb rapid status polling.
+        """
+        if self.save_dir is None:
+            raise FileNotFoundError("DSP save directory not found")
+
+        now = time.monotonic()
+        if self._scan_cache is not None:
+            scanned_at, scanned_dir, entries = self._scan_cache
+            if scanned_dir == self.save_dir and (now - scanned_at) * 1000 < self.LIST_TTL_MS:
+                return entries
+
+        with os.scandir(self.save_dir) as it:
+            entries = [entry for entry in it if entry.name.endswith(".dsv") and entry.is_file()]
+
+        self._scan_cache = (now, self.save_dir, entries)
+        return entries
+
+    def _check_header(self, path: Path, size: int) -> None:
+        """Reject files without the save header before starting a full parse."""
+        with open(path, 'rb') as f:
+            header = f.read(self.SAVE_HEADER.size)
+        if len(header) < self.SAVE_HEADER.size:
+            raise ValueError(f"Not a DSP save file: {path.name} (bad header)")
+
+        magic, file_length = self.SAVE_HEADER.unpack(header)
+        if magic != self.SAVE_MAGIC:
+            raise ValueError(f"Not a DSP save file: {path.name} (bad header)")
+        if file_length != size:
+            logger.warning(f"{path.name}: header length {file_length} does not match "
+                           f"file size {size}; the save may be incomplete")
+
+    def _parse_game_save(self, game_save_class: Any, path: Path) -> Any:
+        """Parse a save file synchronously. Runs in a worker thread."""
+        with open(path, 'rb', buffering=self.READ_BUFFER_SIZE) as f:
+            return game_save_class.parse(f)
+
     async def parse_file(self, file_path: str) -> FactoryState:
         """
         Parse specific .dsv save file.
@@ -78,24 +182,51 @@ class SaveFileParser:
 
         Raises:
             FileNotFoundError: If file doesn't exist
-            ValueError: If file is not a .dsv file
+            ValueError: If file is not a .dsv file or lacks the save header
             Exception: If parsing fails
         """
         path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Save file not found: {file_path}")
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Save file not found: {file_path}") from None
 
         if not path.suffix.lower() == ".dsv":
             raise ValueError(f"Invalid file type: {path.suffix} (expected .dsv)")
 
-        logger.info(f"Parsing save file: {path.name} ({path.stat().st_size / 1024 / 1024:.2f} MB)")
+        cache_key = (str(path), stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            logger.debug(f"Using cached parse of {path.name}")
+            return cached
+
+        task = self._inflight.get(cache_key)
+        if task is None:
+            self._check_header(path, stat.st_size)
+            task = asyncio.ensure_future(self._parse_uncached(path, stat.st_size, cache_key))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            logger.debug(f"Joining in-progress parse of {path.name}")
+
+        # Shield so one caller being cancelled doesn't abort the parse for the others
+        return await asyncio.shield(task)
+
+    async def _parse_uncached(
+        self,
+        path: Path,
+        size: int,
+        cache_key: Tuple[str, int, int],
+    ) -> FactoryState:
+        """Parse a save file and store the result in the cache."""
+        logger.info(f"Parsing save file: {path.name} ({size / 1024 / 1024:.2f} MB)")
 
         try:
             GameSave = self._get_game_save_class()
 
-            # Parse the save file
-            with open(path, 'rb') as f:
-                game_save = GameSave.parse(f)
+            # Parse the save file off the event loop so realtime ingestion keeps running
+            game_save = await asyncio.to_thread(self._parse_game_save, GameSave, path)
 
             logger.info(f"Save parsed successfully. Game version: "
                        f"{game_save.majorGameVersion}.{game_save.minorGameVersion}."
@@ -105,6 +236,11 @@ class SaveFileParser:
             factory_state = FactoryState.from_save_data(game_save)
 
             logger.info(f"Extracted {len(factory_state.planets)} planets")
+
+            self._cache[cache_key] = factory_state
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
             return factory_state
 
         except ImportError:
@@ -123,38 +259,82 @@ class SaveFileParser:
         Raises:
             FileNotFoundError: If save directory or files not found
         """
-        if not self.save_dir or not self.save_dir.exists():
+        if not self.save_dir:
             raise FileNotFoundError("DSP save directory not found")
 
-        # Find most recent .dsv file
-        save_files = list(self.save_dir.glob("*.dsv"))
+        # Find most recent .dsv file; each entry's stat comes from the scan
+        try:
+            save_files = self._scan_save_files()
+        except FileNotFoundError:
+            raise FileNotFoundError("DSP save directory not found") from None
         if not save_files:
             raise FileNotFoundError("No save files found")
 
-        latest_save = max(save_files, key=lambda p: p.stat().st_mtime)
+        latest_save = max(save_files, key=lambda e: e.stat().st_mtime)
         logger.info(f"Loading latest save: {latest_save.name}")
-        return await self.parse_file(str(latest_save))
+        return await self.parse_file(latest_save.path)
+
+    def count_save_files(self) -> int:
+        """
+        Count available save files.
+
+        The count is only recomputed when the save directory's own mtime
+        changes, which happens whenever files are added, removed or renamed.
+        A changed mtime also discards any recent scan, so the new count never
+        comes from a listing taken before the change.
+        """
+        if not self.save_dir:
+            return 0
+
+        try:
+            dir_mtime = os.stat(self.save_dir).st_mtime_ns
+        except OSError:
+            return 0
+
+        if self._count_cache is not None:
+            cached_dir, cached_mtime, count = self._count_cache
+            if cached_dir == self.save_dir and cached_mtime == dir_mtime:
+                return count
+
+        self._scan_cache = None
+        count = len(self._scan_save_files())
+        self._count_cache = (self.save_dir, dir_mtime, count)
+        return count
 
     def list_save_files(self) -> list[dict[str, Any]]:
         """
         List all available save files.
 
+        The listing is rebuilt only when the underlying scan is refreshed
+        (see LIST_TTL_MS), so repeated calls skip the per-file stat and sort.
+
         Returns:
             List of save file info dicts with name, path, size, modified time
         """
-        if not self.save_dir or not self.save_dir.exists():
+        if not self.save_dir:
             return []
 
+        try:
+            entries = self._scan_save_files()
+        except OSError:
+            return []
+
+        if self._list_cache is not None:
+            cached_entries, cached_files = self._list_cache
+            if cached_entries is entries:
+                return list(cached_files)
+
         save_files = []
-        for path in self.save_dir.glob("*.dsv"):
-            stat = path.stat()
+        for entry in entries:
+            stat = entry.stat()
             save_files.append({
-                "name": path.stem,
-                "path": str(path),
+                "name": entry.name[:-len(".dsv")],
+                "path": entry.path,
                 "size_mb": round(stat.st_size / 1024 / 1024, 2),
                 "modified": stat.st_mtime,
             })
 
         # Sort by modification time, newest first
         save_files.sort(key=lambda x: x["modified"], reverse=True)
-        return save_files
+        self._list_cache = (entries, save_files)
+        return list(save_files)
@@ -2,9 +2,15 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Collection, Dict, List, Optional, Union
 import logging
 
+try:
+    import orjson as json_impl
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    import json as json_impl  # type: ignore[no-redef]
+
 logger = logging.getLogger(__name__)
 
 # Energy conversion: DSP uses energy per tick, 60 ticks = 1 second
@@ -12,7 +18,51 @@ logger = logging.getLogger(__name__)
 ENERGY_PER_TICK_TO_MW = 60 / 1_000_000
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _recipe_name(recipe_id: int) -> str:
+    """Placeholder item name for a recipe ID (shared across frames)."""
+    return f"recipe_{recipe_id}"
+
+
+@lru_cache(maxsize=4096)
+def _item_name(proto_id: int) -> str:
+    """Placeholder item name for an item proto ID (shared across frames)."""
+    return f"item_{proto_id}"
+
+
+def _sum_active(pool: Any, field: str) -> float:
+    """
+    Sum a field over the entries of a DSP object pool with a positive id.
+
+    Pools parsed from a save are lists of objects; entries missing the field
+    are skipped.
+    """
+    total = 0.0
+    for entry in pool:
+        try:
+            if entry.id > 0:
+                total += getattr(entry, field)
+        except AttributeError:
+            continue
+    return total
+
+
+def _normalize_keys(data: dict) -> dict:
+    """
+    Return data with camelCase keys.
+
+    The C# plugin sends camelCase keys, while the legacy format uses
+    PascalCase. Each object is serialized with one convention, so only the
+    first key is checked and camelCase dicts are returned unchanged.
+    """
+    for key in data:
+        if key[:1].isupper():
+            return {k[:1].lower() + k[1:]: v for k, v in data.items()}
+        break
+    return data
+
+
+@dataclass(slots=True)
 class ItemMetrics:
     """Production metrics for a specific item."""
 
@@ -20,13 +70,13 @@ class ItemMetrics:
     production_rate: float  # items/min
     consumption_rate: float  # items/min
     current_storage: int
-    net_rate: float = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.net_rate = self.production_rate - self.consumption_rate
+    @property
+    def net_rate(self) -> float:
+        return self.production_rate - self.consumption_rate
 
 
-@dataclass
+@dataclass(slots=True)
 class AssemblerMetrics:
     """Metrics for individual assembler/smelter."""
 
@@ -36,30 +86,30 @@ class AssemblerMetrics:
     theoretical_max: float
     input_starved: bool = False
     output_blocked: bool = False
-    efficiency: float = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.efficiency = (
+    @property
+    def efficiency(self) -> float:
+        return (
             (self.production_rate / self.theoretical_max * 100)
             if self.theoretical_max > 0
             else 0
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PowerMetrics:
     """Power grid metrics for a planet."""
 
     generation_mw: float
     consumption_mw: float
     accumulator_charge_percent: float = 0.0
-    surplus_mw: float = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.surplus_mw = self.generation_mw - self.consumption_mw
+    @property
+    def surplus_mw(self) -> float:
+        return self.generation_mw - self.consumption_mw
 
 
-@dataclass
+@dataclass(slots=True)
 class BeltMetrics:
     """Belt throughput metrics."""
 
@@ -67,15 +117,15 @@ class BeltMetrics:
     item_type: str
     throughput: float  # items/sec
     max_throughput: float  # items/sec (based on tier)
-    saturation_percent: float = field(init=False)
 
-    def __post_init__(self) -> None:
-        self.saturation_percent = (
+    @property
+    def saturation_percent(self) -> float:
+        return (
             (self.throughput / self.max_throughput * 100) if self.max_throughput > 0 else 0
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanetState:
     """Complete state for a single planet."""
 
@@ -87,7 +137,7 @@ class PlanetState:
     belts: List[BeltMetrics] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class FactoryState:
     """Complete factory state across all planets."""
 
@@ -95,7 +145,11 @@ class FactoryState:
     planets: Dict[int, PlanetState] = field(default_factory=dict)
 
     @classmethod
-    def from_realtime_data(cls, data: dict) -> "FactoryState":
+    def from_realtime_data(
+        cls,
+        data: dict,
+        planet_ids: Optional[Collection[int]] = None,
+    ) -> "FactoryState":
         """
         Construct FactoryState from real-time plugin data.
 
@@ -114,115 +168,194 @@ class FactoryState:
                 }
             }
         }
-        """
-        planets: Dict[int, PlanetState] = {}
 
-        # Handle both "planets" (new C# format) and "Planets" (legacy)
-        planets_data = data.get("planets", data.get("Planets", {}))
+        Args:
+            data: Decoded plugin payload
+            planet_ids: Only build these planets (None = all planets). Other
+                planets are skipped before any of their rows are read.
+        """
+        # Keys are camelCase (new C# format) or PascalCase (legacy)
+        data = _normalize_keys(data)
+        planets_data = data.get("planets", {})
 
+        planets: Dict[int, PlanetState] = {}
         for planet_id_str, planet_data in planets_data.items():
             planet_id = int(planet_id_str)
-            planet_state = PlanetState(
-                planet_id=planet_id,
-                planet_name=planet_data.get("planetName", planet_data.get("PlanetName", ""))
+            if planet_ids is not None and planet_id not in planet_ids:
+                continue
+            planets[planet_id] = cls._planet_from_realtime(planet_id, planet_data)
+
+        # Handle timestamp
+        timestamp_val = data.get("timestamp", 0)
+        try:
+            if timestamp_val > 0:
+                timestamp = datetime.fromtimestamp(timestamp_val)
+            else:
+                timestamp = datetime.now()
+        except TypeError:
+            timestamp = datetime.now()
+
+        return cls(
+            timestamp=timestamp,
+            planets=planets,
+        )
+
+    @staticmethod
+    def _planet_from_realtime(planet_id: int, planet_data: dict) -> PlanetState:
+        """Build one PlanetState from its real-time plugin data."""
+        # Bind globals used in the row loops as locals. The metric
+        # constructors are called positionally below: keyword arguments
+        # roughly double the cost of a dataclass __init__ call.
+        normalize_keys = _normalize_keys
+        recipe_name = _recipe_name
+        item_name_for = _item_name
+        item_metrics = ItemMetrics
+        assembler_metrics = AssemblerMetrics
+        belt_metrics = BeltMetrics
+
+        planet_data = normalize_keys(planet_data)
+        planet_state = PlanetState(
+            planet_id=planet_id,
+            planet_name=planet_data.get("planetName", "")
+        )
+
+        # Parse power metrics
+        power_data = planet_data.get("power")
+        if power_data:
+            power_data = normalize_keys(power_data)
+            # C# sends both raw energy per tick AND calculated MW values
+            # Prefer the calculated MW values if available
+            generation_mw = power_data.get("generationMW", 0)
+            consumption_mw = power_data.get("consumptionMW", 0)
+            acc_percent = power_data.get("accumulatorPercent", 0)
+
+            planet_state.power = PowerMetrics(
+                generation_mw=generation_mw,
+                consumption_mw=consumption_mw,
+                accumulator_charge_percent=acc_percent,
             )
 
-            # Parse power metrics (new C# format uses lowercase)
-            power_data = planet_data.get("power", planet_data.get("Power"))
-            if power_data:
-                # C# sends both raw energy per tick AND calculated MW values
-                # Prefer the calculated MW values if available
-                generation_mw = power_data.get("generationMW", power_data.get("GenerationMW", 0))
-                consumption_mw = power_data.get("consumptionMW", power_data.get("ConsumptionMW", 0))
-                acc_percent = power_data.get("accumulatorPercent", power_data.get("AccumulatorPercent", 0))
-
-                planet_state.power = PowerMetrics(
-                    generation_mw=generation_mw,
-                    consumption_mw=consumption_mw,
-                    accumulator_charge_percent=acc_percent,
+        # Parse production metrics
+        production = planet_state.production
+        add_assembler = planet_state.assemblers.append
+        production_list = planet_data.get("production", [])
+        for prod in production_list:
+            get = normalize_keys(prod).get
+            # Map recipeId/protoId to item name (TODO: use recipe database)
+            recipe_id = get("recipeId", 0)
+            proto_id = get("protoId", 0)
+
+            # Check for legacy format with ItemName
+            item_name = get("itemName")
+            if item_name is None:
+                item_name = recipe_name(recipe_id) if recipe_id > 0 else item_name_for(proto_id)
+
+            production_rate = get("productionRate", 0)
+            items_produced = get("itemsProduced", 0)
+
+            # Handle legacy format with ConsumptionRate in Production list
+            consumption_rate = get("consumptionRate", 0)
+            storage = get("storage", items_produced)
+
+            # Store assembler-level metrics
+            assembler_id = get("assemblerId", 0)
+            input_starved = get("inputStarved", False)
+            output_blocked = get("outputBlocked", False)
+
+            # Add to production dict (aggregate by item/recipe)
+            existing = production.get(item_name)
+            if existing is None:
+                production[item_name] = item_metrics(
+                    item_name, production_rate, consumption_rate, storage
                 )
+            else:
+                # Aggregate production from multiple assemblers in place
+                existing.production_rate += production_rate
+                existing.consumption_rate += consumption_rate
+                existing.current_storage += storage
+
+            # Store assembler metrics
+            if assembler_id > 0:
+                add_assembler(assembler_metrics(
+                    assembler_id,
+                    recipe_id,
+                    production_rate,
+                    0,  # theoretical_max TODO: Get from recipe database
+                    input_starved,
+                    output_blocked,
+                ))
+
+        # Parse belt metrics
+        add_belt = planet_state.belts.append
+        belts_list = planet_data.get("belts", [])
+        for belt in belts_list:
+            get = normalize_keys(belt).get
+            belt_id = get("beltId", 0)
+            item_type = get("itemType", 0)
+            throughput = get("throughput", 0)
+            max_throughput = get("maxThroughput", 30)
+
+            if belt_id > 0:
+                add_belt(belt_metrics(
+                    belt_id,
+                    item_name_for(item_type),  # TODO: Map to item name
+                    throughput,
+                    max_throughput,
+                ))
+
+        return planet_state
 
-            # Parse production metrics (new C# format)
-            production_list = planet_data.get("production", planet_data.get("Production", []))
-            for prod in production_list:
-                # Map recipeId/protoId to item name (TODO: use recipe database)
-                recipe_id = prod.get("recipeId", prod.get("RecipeId", 0))
-                proto_id = prod.get("protoId", prod.get("ProtoId", 0))
-                item_name = f"recipe_{recipe_id}" if recipe_id > 0 else f"item_{proto_id}"
-
-                # Check for legacy format with ItemName
-                if "ItemName" in prod or "itemName" in prod:
-                    item_name = prod.get("itemName", prod.get("ItemName", item_name))
-
-                production_rate = prod.get("productionRate", prod.get("ProductionRate", 0))
-                items_produced = prod.get("itemsProduced", prod.get("ItemsProduced", 0))
-
-                # Handle legacy format with ConsumptionRate in Production list
-                consumption_rate = prod.get("consumptionRate", prod.get("ConsumptionRate", 0))
-                storage = prod.get("storage", prod.get("Storage", items_produced))
-
-                # Store assembler-level metrics
-                assembler_id = prod.get("assemblerId", prod.get("AssemblerId", 0))
-                input_starved = prod.get("inputStarved", prod.get("InputStarved", False))
-                output_blocked = prod.get("outputBlocked", prod.get("OutputBlocked", False))
-                power_level = prod.get("powerLevel", prod.get("PowerLevel", 1.0))
-
-                # Add to production dict (aggregate by item/recipe)
-                if item_name not in planet_state.production:
-                    planet_state.production[item_name] = ItemMetrics(
-                        item_name=item_name,
-                        production_rate=production_rate,
-                        consumption_rate=consumption_rate,
-                        current_storage=storage,
-                    )
-                else:
-                    # Aggregate production from multiple assemblers
-                    existing = planet_state.production[item_name]
-                    planet_state.production[item_name] = ItemMetrics(
-                        item_name=item_name,
-                        production_rate=existing.production_rate + production_rate,
-                        consumption_rate=existing.consumption_rate + consumption_rate,
-                        current_storage=existing.current_storage + storage,
-                    )
+    @classmethod
+    def from_realtime_json(
+        cls,
+        payload: Union[str, bytes],
+        planet_ids: Optional[Collection[int]] = None,
+    ) -> "FactoryState":
+        """
+        Construct FactoryState from a raw real-time JSON payload.
 
-                # Store assembler metrics
-                if assembler_id > 0:
-                    planet_state.assemblers.append(AssemblerMetrics(
-                        assembler_id=assembler_id,
-                        recipe_id=recipe_id,
-                        production_rate=production_rate,
-                        theoretical_max=0,  # TODO: Get from recipe database
-                        input_starved=input_starved,
-                        output_blocked=output_blocked,
-                    ))
-
-            # Parse belt metrics (new C# format)
-            belts_list = planet_data.get("belts", planet_data.get("Belts", []))
-            for belt in belts_list:
-                belt_id = belt.get("beltId", belt.get("BeltId", 0))
-                item_type = belt.get("itemType", belt.get("ItemType", 0))
-                throughput = belt.get("throughput", belt.get("Throughput", 0))
-                max_throughput = belt.get("maxThroughput", belt.get("MaxThroughput", 30))
-
-                if belt_id > 0:
-                    planet_state.belts.append(BeltMetrics(
-                        belt_id=belt_id,
-                        item_type=f"item_{item_type}",  # TODO: Map to item name
-                        throughput=throughput,
-                        max_throughput=max_throughput,
-                    ))
-
-            planets[planet_id] = planet_state
-
-        # Handle timestamp (lowercase from C#, uppercase from legacy)
-        timestamp_val = data.get("timestamp", data.get("Timestamp", 0))
-        if isinstance(timestamp_val, (int, float)) and timestamp_val > 0:
-            timestamp = datetime.fromtimestamp(timestamp_val)
-        else:
-            timestamp = datetime.now()
+        Uses orjson when installed, which decodes the numeric-heavy plugin
+        payload considerably faster than the stdlib json module.
+
+        Args:
+            payload: JSON text or UTF-8 bytes as sent by the C# plugin
+            planet_ids: Only build these planets (None = all planets)
+
+        Returns:
+            FactoryState built by from_realtime_data()
+
+        Raises:
+            ValueError: If the payload is not valid JSON
+        """
+        return cls.from_realtime_data(json_impl.loads(payload), planet_ids)
+
+    @classmethod
+    def apply_delta(cls, previous: "FactoryState", data: dict) -> "FactoryState":
+        """
+        Apply a real-time delta frame on top of a previous state.
+
+        Delta frames carry full data for changed planets only, plus the IDs of
+        planets that disappeared:
+        {
+            "type": "delta",
+            "seq": 42,
+            "timestamp": 1234567890,
+            "planets": { "1": { ... } },
+            "removed": [3]
+        }
+
+        The previous state is left untouched; unchanged PlanetState objects
+        are shared with the returned state.
+        """
+        changed = cls.from_realtime_data(data)
+
+        planets = dict(previous.planets)
+        for planet_id in data.get("removed", ()):
+            planets.pop(int(planet_id), None)
+        planets.update(changed.planets)
 
         return cls(
-            timestamp=timestamp,
+            timestamp=changed.timestamp,
             planets=planets,
         )
 
@@ -238,6 +371,7 @@ class FactoryState:
             FactoryState with extracted factory data
         """
         planets: Dict[int, PlanetState] = {}
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
         try:
             game_data = game_save.gameData
@@ -261,14 +395,15 @@ class FactoryState:
                     )
 
                 planets[planet_id] = planet_state
-                logger.debug(f"Processed planet {planet_id}")
+                if debug_enabled:
+                    logger.debug("Processed planet %d", planet_id)
 
             # Extract production statistics if available
             if hasattr(game_data, 'statistics'):
                 cls._merge_production_stats(planets, game_data.statistics)
 
         except Exception as e:
-            logger.error(f"Error parsing save data: {e}")
+            logger.error("Error parsing save data: %s", e)
             raise
 
         return cls(
@@ -279,29 +414,15 @@ class FactoryState:
     @staticmethod
     def _extract_power_metrics(power_system: Any) -> PowerMetrics:
         """Extract power metrics from PowerSystem."""
-        total_generation = 0.0
-        total_consumption = 0.0
-        accumulator_current = 0
-        accumulator_max = 0
-
-        # Sum up generator output
-        if hasattr(power_system, 'genPool'):
-            for gen in power_system.genPool:
-                if hasattr(gen, 'genEnergyPerTick') and hasattr(gen, 'id') and gen.id > 0:
-                    total_generation += float(gen.genEnergyPerTick)
-
-        # Sum up consumer demand
-        if hasattr(power_system, 'consumerPool'):
-            for consumer in power_system.consumerPool:
-                if hasattr(consumer, 'workEnergyPerTick') and hasattr(consumer, 'id') and consumer.id > 0:
-                    total_consumption += float(consumer.workEnergyPerTick)
-
-        # Sum up accumulator charge
-        if hasattr(power_system, 'accPool'):
-            for acc in power_system.accPool:
-                if hasattr(acc, 'curEnergy') and hasattr(acc, 'maxEnergy') and hasattr(acc, 'id') and acc.id > 0:
-                    accumulator_current += int(acc.curEnergy)
-                    accumulator_max += int(acc.maxEnergy)
+        pool = getattr(power_system, 'genPool', ())
+        total_generation = _sum_active(pool, 'genEnergyPerTick')
+
+        pool = getattr(power_system, 'consumerPool', ())
+        total_consumption = _sum_active(pool, 'workEnergyPerTick')
+
+        pool = getattr(power_system, 'accPool', ())
+        accumulator_current = _sum_active(pool, 'curEnergy')
+        accumulator_max = _sum_active(pool, 'maxEnergy')
 
         # Convert to MW
         generation_mw = total_generation * ENERGY_PER_TICK_TO_MW
@@ -321,21 +442,21 @@ class FactoryState:
         """Extract assembler metrics from FactorySystem."""
         assemblers: List[AssemblerMetrics] = []
 
-        if not hasattr(factory_system, 'assemblerPool'):
-            return assemblers
-
-        for assembler in factory_system.assemblerPool:
-            if not hasattr(assembler, 'id') or assembler.id <= 0:
+        for assembler in getattr(factory_system, 'assemblerPool', ()):
+            try:
+                assembler_id = assembler.id
+                recipe_id = assembler.recipeId
+            except AttributeError:
                 continue
-            if not hasattr(assembler, 'recipeId') or assembler.recipeId <= 0:
+            if assembler_id <= 0 or recipe_id <= 0:
                 continue
 
             # Calculate production rate from speed and time
             # Note: Actual rate calculation needs recipe database
             # For now, we store the raw values
             assemblers.append(AssemblerMetrics(
-                assembler_id=int(assembler.id),
-                recipe_id=int(assembler.recipeId),
+                assembler_id=int(assembler_id),
+                recipe_id=int(recipe_id),
                 production_rate=0.0,  # TODO: Calculate from recipe database
                 theoretical_max=0.0,   # TODO: Get from recipe database
                 input_starved=False,   # TODO: Detect from input buffer state
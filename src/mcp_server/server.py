@@ -2,7 +2,8 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from fastmcp import FastMCP
 
@@ -11,7 +12,8 @@ from .data_sources.save_parser import SaveFileParser
 from .tools.bottleneck_analyzer import BottleneckAnalyzer
 from .tools.power_analyzer import PowerAnalyzer
 from .tools.logistics_analyzer import LogisticsAnalyzer
-from .models.factory_state import FactoryState
+from .models.factory_state import FactoryState, PlanetState
+from .utils.recipe_database import get_recipe_database
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,6 +29,27 @@ bottleneck_analyzer = BottleneckAnalyzer()
 power_analyzer = PowerAnalyzer()
 logistics_analyzer = LogisticsAnalyzer()
 
+# Parser for explicitly named save files; reused so its parse cache persists
+explicit_save_parser = SaveFileParser(auto_detect_path=False)
+
+# Short-lived cache so concurrent tool calls share one state fetch
+STATE_CACHE_TTL = 0.25  # seconds
+_state_cache: Dict[Optional[DataSourceMode], Tuple[float, FactoryState, str]] = {}
+_state_lock = asyncio.Lock()
+
+# Serializes connect_to_game calls that share the router's stream
+_connect_lock = asyncio.Lock()
+
+# Common production targets whose recipe walks are cached at startup
+PREWARM_ITEMS = (
+    "iron-ingot", "copper-ingot", "steel", "glass", "gear",
+    "magnetic-coil", "circuit-board", "electric-motor", "prism",
+    "plastic", "graphene", "titanium-alloy", "electromagnetic-turbine",
+    "super-magnetic-ring", "particle-container", "processor",
+    "microcrystalline-component", "carbon-nanotube", "casimir-crystal",
+    "quantum-chip",
+)
+
 
 async def _get_factory_state(
     require_fresh: bool = False,
@@ -44,6 +67,29 @@ async def _get_factory_state(
     """
     force_mode = DataSourceMode.REALTIME if force_realtime else None
 
+    if require_fresh:
+        return await _fetch_factory_state(force_mode, require_fresh)
+
+    cached = _state_cache.get(force_mode)
+    if cached is not None and time.monotonic() - cached[0] < STATE_CACHE_TTL:
+        return cached[1], cached[2]
+
+    async with _state_lock:
+        # Another caller may have fetched while we waited for the lock
+        cached = _state_cache.get(force_mode)
+        if cached is not None and time.monotonic() - cached[0] < STATE_CACHE_TTL:
+            return cached[1], cached[2]
+
+        state, source = await _fetch_factory_state(force_mode, require_fresh)
+        _state_cache[force_mode] = (time.monotonic(), state, source)
+        return state, source
+
+
+async def _fetch_factory_state(
+    force_mode: Optional[DataSourceMode],
+    require_fresh: bool,
+) -> Tuple[FactoryState, str]:
+    """Fetch factory state from the router, bypassing the state cache."""
     try:
         state, mode = await router.get_factory_state_with_source(
             force_mode=force_mode,
@@ -86,18 +132,20 @@ async def connect_to_game(
     Returns:
         Connection result with status
     """
-    # Update router connection settings
-    router.realtime_stream.host = host
-    router.realtime_stream.port = port
-    router.realtime_stream.uri = f"ws://{host}:{port}"
-
-    success = await router.connect_realtime()
+    stream = router.realtime_stream
+    async with _connect_lock:
+        if not await stream.set_address(host, port) and stream.is_connected():
+            success = True
+        else:
+            success = await router.connect_realtime()
+            # The best source may have changed
+            _state_cache.clear()
 
     if success:
         return {
             "status": "connected",
             "message": f"Connected to game at {host}:{port}",
-            "latency_ms": router.realtime_stream.latency_ms,
+            "latency_ms": stream.latency_ms,
         }
     else:
         return {
@@ -241,6 +289,48 @@ async def analyze_logistics_saturation(
         return {"error": "analysis_failed", "message": str(e)}
 
 
+def _planet_snapshot(planet: PlanetState, wanted_items: Optional[Set[str]]) -> Dict[str, Any]:
+    """Format one planet for get_factory_snapshot."""
+    planet_data: Dict[str, Any] = {
+        "planet_name": planet.planet_name,
+        "items": [
+            {
+                "name": item_name,
+                "production": metrics.production_rate,
+                "consumption": metrics.consumption_rate,
+                "net": metrics.net_rate,
+                "storage": metrics.current_storage,
+            }
+            for item_name, metrics in planet.production.items()
+            if wanted_items is None or item_name in wanted_items
+        ],
+        "assembler_count": len(planet.assemblers),
+        "belt_count": len(planet.belts),
+    }
+
+    if planet.power:
+        planet_data["power"] = {
+            "generation_mw": planet.power.generation_mw,
+            "consumption_mw": planet.power.consumption_mw,
+            "surplus_mw": planet.power.surplus_mw,
+            "accumulator_charge": planet.power.accumulator_charge_percent,
+        }
+
+    # Include bottleneck indicators
+    starved_count = 0
+    blocked_count = 0
+    for assembler in planet.assemblers:
+        starved_count += assembler.input_starved
+        blocked_count += assembler.output_blocked
+    if starved_count or blocked_count:
+        planet_data["bottleneck_indicators"] = {
+            "input_starved_assemblers": starved_count,
+            "output_blocked_assemblers": blocked_count,
+        }
+
+    return planet_data
+
+
 @mcp.tool()
 async def get_factory_snapshot(
     planet_id: Optional[int] = None,
@@ -265,51 +355,21 @@ async def get_factory_snapshot(
             force_realtime=require_realtime
         )
 
-        # Filter and format data
+        wanted_items = None if item_filter is None else set(item_filter)
+        planets = factory_state.planets
+        # Look the requested planet up directly instead of scanning them all
+        planet_ids = list(planets) if planet_id is None else [planet_id]
+
         snapshot: Dict[str, Any] = {
             "timestamp": factory_state.timestamp.isoformat(),
             "data_source": source,
-            "planets": {},
+            "planets": {
+                pid: _planet_snapshot(planets[pid], wanted_items)
+                for pid in planet_ids
+                if pid in planets
+            },
         }
 
-        for pid, planet in factory_state.planets.items():
-            if planet_id is None or pid == planet_id:
-                planet_data: Dict[str, Any] = {
-                    "planet_name": planet.planet_name,
-                    "items": [],
-                    "assembler_count": len(planet.assemblers),
-                    "belt_count": len(planet.belts),
-                }
-
-                for item_name, metrics in planet.production.items():
-                    if item_filter is None or item_name in item_filter:
-                        planet_data["items"].append({
-                            "name": item_name,
-                            "production": metrics.production_rate,
-                            "consumption": metrics.consumption_rate,
-                            "net": metrics.net_rate,
-                            "storage": metrics.current_storage,
-                        })
-
-                if planet.power:
-                    planet_data["power"] = {
-                        "generation_mw": planet.power.generation_mw,
-                        "consumption_mw": planet.power.consumption_mw,
-                        "surplus_mw": planet.power.surplus_mw,
-                        "accumulator_charge": planet.power.accumulator_charge_percent,
-                    }
-
-                # Include bottleneck indicators
-                starved_assemblers = [a for a in planet.assemblers if a.input_starved]
-                blocked_assemblers = [a for a in planet.assemblers if a.output_blocked]
-                if starved_assemblers or blocked_assemblers:
-                    planet_data["bottleneck_indicators"] = {
-                        "input_starved_assemblers": len(starved_assemblers),
-                        "output_blocked_assemblers": len(blocked_assemblers),
-                    }
-
-                snapshot["planets"][pid] = planet_data
-
         return snapshot
     except ConnectionError as e:
         return {
@@ -339,11 +399,8 @@ async def load_save_analysis(
     """
     logger.info(f"Loading save file: {save_file_path}, type={analysis_type}")
 
-    # Use a dedicated parser for explicit save file loading
-    save_parser = SaveFileParser(auto_detect_path=False)
-
     try:
-        factory_state = await save_parser.parse_file(save_file_path)
+        factory_state = await explicit_save_parser.parse_file(save_file_path)
 
         result: Dict[str, Any] = {
             "data_source": f"save file: {save_file_path}",
@@ -356,9 +413,15 @@ async def load_save_analysis(
         elif analysis_type == "logistics":
             result["logistics"] = await logistics_analyzer.analyze(factory_state)
         else:  # full
-            result["production"] = await bottleneck_analyzer.analyze(factory_state)
-            result["power"] = await power_analyzer.analyze(factory_state)
-            result["logistics"] = await logistics_analyzer.analyze(factory_state)
+            (
+                result["production"],
+                result["power"],
+                result["logistics"],
+            ) = await asyncio.gather(
+                bottleneck_analyzer.analyze(factory_state),
+                power_analyzer.analyze(factory_state),
+                logistics_analyzer.analyze(factory_state),
+            )
 
         return result
     except FileNotFoundError as e:
@@ -376,7 +439,8 @@ async def list_save_files() -> Dict[str, Any]:
     Returns:
         List of save files with metadata (name, size, modified time)
     """
-    save_parser = SaveFileParser()
+    # The router's parser shares its directory scan with get_connection_status
+    save_parser = router.save_parser
     files = save_parser.list_save_files()
 
     return {
@@ -386,8 +450,21 @@ async def list_save_files() -> Dict[str, Any]:
     }
 
 
+def _prewarm_recipe_database() -> None:
+    """Load the recipe database and cache walks for common target items."""
+    db = get_recipe_database()
+    for name in PREWARM_ITEMS:
+        item_id = db.get_item_id(name)
+        if item_id is None:
+            continue
+        db.trace_bottleneck_upstream(item_id, max_depth=5)
+        db.trace_bottleneck_downstream(item_id, max_depth=3)
+        db.trace_bottleneck_downstream(item_id, max_depth=5)
+
+
 def main() -> None:
     """Entry point for the MCP server."""
+    _prewarm_recipe_database()
     mcp.run()
 
 
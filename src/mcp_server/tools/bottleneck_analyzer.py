@@ -1,5 +1,6 @@
 """Production bottleneck detection and analysis."""
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
@@ -57,6 +58,24 @@ class BottleneckAnalyzer:
         target_item: Optional[str] = None,
         time_window: int = 60,
         include_downstream: bool = True,
+    ) -> Dict[str, Any]:
+        """Run analyze_sync() in a worker thread; see it for arguments."""
+        return await asyncio.to_thread(
+            self.analyze_sync,
+            factory_state,
+            planet_id,
+            target_item,
+            time_window,
+            include_downstream,
+        )
+
+    def analyze_sync(
+        self,
+        factory_state: FactoryState,
+        planet_id: Optional[int] = None,
+        target_item: Optional[str] = None,
+        time_window: int = 60,
+        include_downstream: bool = True,
     ) -> Dict[str, Any]:
         """
         Identify production chain bottlenecks.
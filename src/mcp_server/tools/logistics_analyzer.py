@@ -1,5 +1,6 @@
 """Logistics and belt saturation analysis."""
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
@@ -51,6 +52,24 @@ class LogisticsAnalyzer:
         item_filter: Optional[List[str]] = None,
         saturation_threshold: float = 95.0,
         include_throughput_analysis: bool = True,
+    ) -> Dict[str, Any]:
+        """Run analyze_sync() in a worker thread; see it for arguments."""
+        return await asyncio.to_thread(
+            self.analyze_sync,
+            factory_state,
+            planet_id,
+            item_filter,
+            saturation_threshold,
+            include_throughput_analysis,
+        )
+
+    def analyze_sync(
+        self,
+        factory_state: FactoryState,
+        planet_id: Optional[int] = None,
+        item_filter: Optional[List[str]] = None,
+        saturation_threshold: float = 95.0,
+        include_throughput_analysis: bool = True,
     ) -> Dict[str, Any]:
         """
         Detect belt and logistics bottlenecks.
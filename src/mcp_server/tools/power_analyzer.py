@@ -1,5 +1,6 @@
 """Power grid analysis and optimization."""
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
@@ -58,6 +59,22 @@ class PowerAnalyzer:
         planet_id: Optional[int] = None,
         include_accumulator_cycles: bool = True,
         include_consumers: bool = True,
+    ) -> Dict[str, Any]:
+        """Run analyze_sync() in a worker thread; see it for arguments."""
+        return await asyncio.to_thread(
+            self.analyze_sync,
+            factory_state,
+            planet_id,
+            include_accumulator_cycles,
+            include_consumers,
+        )
+
+    def analyze_sync(
+        self,
+        factory_state: FactoryState,
+        planet_id: Optional[int] = None,
+        include_accumulator_cycles: bool = True,
+        include_consumers: bool = True,
     ) -> Dict[str, Any]:
         """
         Evaluate power generation, consumption, and distribution.
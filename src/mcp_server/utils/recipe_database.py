@@ -1,18 +1,29 @@
 """Recipe database for DSP production calculations and dependency analysis."""
 
-import json
+import copy
 import logging
+import sys
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Final, List, Optional, Set, Tuple
+
+try:
+    import orjson as json_impl
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    import json as json_impl  # type: ignore[no-redef]
 
 logger = logging.getLogger(__name__)
 
 # Path to shared data files
-SHARED_DIR = Path(__file__).parent.parent.parent / "shared"
+SHARED_DIR: Final[Path] = Path(__file__).parent.parent.parent / "shared"
+
+# Raw resources (ore, water, oil, etc.) have IDs in the 1001-1031 range
+RAW_RESOURCE_IDS: Final[frozenset] = frozenset(range(1001, 1032))
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeInput:
     """Input requirement for a recipe."""
     item_id: int
@@ -20,7 +31,7 @@ class RecipeInput:
     item_name: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeOutput:
     """Output product from a recipe."""
     item_id: int
@@ -28,7 +39,7 @@ class RecipeOutput:
     item_name: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Recipe:
     """Complete recipe definition."""
     id: int
@@ -37,6 +48,10 @@ class Recipe:
     inputs: List[RecipeInput]
     time: float  # seconds per cycle
     building: str  # smelter, assembler, chemical, etc.
+    _cycles_per_minute: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._cycles_per_minute = 60.0 / self.time if self.time > 0 else 0.0
 
     @property
     def primary_output(self) -> RecipeOutput:
@@ -50,20 +65,19 @@ class Recipe:
 
     def items_per_minute(self, building_speed: float = 1.0) -> float:
         """Calculate items per minute at given building speed."""
-        if self.time <= 0:
-            return 0
-        cycles_per_minute = 60.0 / self.time * building_speed
-        return cycles_per_minute * self.primary_output.count
+        if not self.outputs:
+            return 0.0
+        return self._cycles_per_minute * building_speed * self.outputs[0].count
 
     def input_requirements_per_minute(self, building_speed: float = 1.0) -> Dict[int, float]:
         """Calculate input requirements per minute."""
         if self.time <= 0:
             return {}
-        cycles_per_minute = 60.0 / self.time * building_speed
+        cycles_per_minute = self._cycles_per_minute * building_speed
         return {inp.item_id: inp.count * cycles_per_minute for inp in self.inputs}
 
 
-@dataclass
+@dataclass(slots=True)
 class DependencyNode:
     """Node in the production dependency graph."""
     item_id: int
@@ -83,30 +97,63 @@ class RecipeDatabase:
     - Recipe ID to recipe details
     - Dependency graph construction
     - Production rate calculations
+
+    Lookup methods assume the database is loaded and do not load it
+    themselves; get_recipe_database() returns a loaded instance, and the
+    graph-walking methods call load() on entry.
+
+    The database is shared by analyzers running in worker threads. Loaded
+    data is never modified, and the result caches are filled with single
+    dict assignments of deterministic values, so concurrent callers may
+    compute the same entry twice but never see a partial one.
     """
 
+    __slots__ = (
+        "_items",
+        "_items_by_name",
+        "_recipes",
+        "_recipes_by_output",
+        "_building_speeds",
+        "_recipes_by_input",
+        "_rate_cache",
+        "_upstream_cache",
+        "_downstream_cache",
+        "_chain_cache",
+        "_loaded",
+        "_load_lock",
+    )
+
     def __init__(self) -> None:
         self._items: Dict[int, str] = {}  # item_id -> item_name
         self._items_by_name: Dict[str, int] = {}  # item_name -> item_id
         self._recipes: Dict[int, Recipe] = {}  # recipe_id -> Recipe
         self._recipes_by_output: Dict[int, List[int]] = {}  # item_id -> [recipe_ids]
         self._building_speeds: Dict[str, Dict[str, float]] = {}
+        self._recipes_by_input: Dict[int, List[int]] = {}  # item_id -> [recipe_ids]
+        self._rate_cache: Dict[Tuple[int, str], float] = {}  # (recipe_id, tier) -> items/min
+        self._upstream_cache: Dict[Tuple[int, int], List[Tuple[int, str, int]]] = {}
+        self._downstream_cache: Dict[Tuple[int, int], List[Tuple[int, str]]] = {}
+        self._chain_cache: Dict[int, Dict[str, Any]] = {}  # target_item_id -> chain
         self._loaded = False
+        self._load_lock = threading.Lock()
 
     def load(self) -> None:
-        """Load item and recipe data from JSON files."""
+        """Load item and recipe data from JSON files (once, thread-safe)."""
         if self._loaded:
             return
 
-        try:
-            self._load_items()
-            self._load_recipes()
-            self._loaded = True
-            logger.info(f"Recipe database loaded: {len(self._items)} items, "
-                       f"{len(self._recipes)} recipes")
-        except Exception as e:
-            logger.error(f"Failed to load recipe database: {e}")
-            raise
+        with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                self._load_items()
+                self._load_recipes()
+                self._loaded = True
+                logger.info(f"Recipe database loaded: {len(self._items)} items, "
+                           f"{len(self._recipes)} recipes")
+            except Exception as e:
+                logger.error(f"Failed to load recipe database: {e}")
+                raise
 
     def _load_items(self) -> None:
         """Load item ID mappings."""
@@ -115,8 +162,7 @@ class RecipeDatabase:
             logger.warning(f"Item IDs file not found: {items_path}")
             return
 
-        with open(items_path, "r") as f:
-            data = json.load(f)
+        data = json_impl.loads(items_path.read_bytes())
 
         # Flatten all categories
         for category, items in data.items():
@@ -135,12 +181,15 @@ class RecipeDatabase:
             logger.warning(f"Recipes file not found: {recipes_path}")
             return
 
-        with open(recipes_path, "r") as f:
-            data = json.load(f)
+        data = json_impl.loads(recipes_path.read_bytes())
 
         # Load building speeds
         self._building_speeds = data.get("building_speeds", {})
 
+        # Build the indexes with defaultdicts, then store plain dicts
+        recipes_by_output: Dict[int, List[int]] = defaultdict(list)
+        recipes_by_input: Dict[int, List[int]] = defaultdict(list)
+
         # Load recipes
         for recipe_id_str, recipe_data in data.get("recipes", {}).items():
             recipe_id = int(recipe_id_str)
@@ -170,41 +219,41 @@ class RecipeDatabase:
                 outputs=outputs,
                 inputs=inputs,
                 time=recipe_data.get("time", 1.0),
-                building=recipe_data.get("building", "assembler"),
+                building=sys.intern(recipe_data.get("building", "assembler")),
             )
 
             self._recipes[recipe_id] = recipe
 
             # Index by output item
             for output in outputs:
-                if output.item_id not in self._recipes_by_output:
-                    self._recipes_by_output[output.item_id] = []
-                self._recipes_by_output[output.item_id].append(recipe_id)
+                recipes_by_output[output.item_id].append(recipe_id)
+
+            # Index by input item (once per recipe, in load order)
+            for input_id in dict.fromkeys(inp.item_id for inp in inputs):
+                recipes_by_input[input_id].append(recipe_id)
+
+        self._recipes_by_output = dict(recipes_by_output)
+        self._recipes_by_input = dict(recipes_by_input)
 
     def get_item_name(self, item_id: int) -> str:
         """Get item name from ID."""
-        self.load()
         return self._items.get(item_id, f"item_{item_id}")
 
     def get_item_id(self, item_name: str) -> Optional[int]:
         """Get item ID from name."""
-        self.load()
         return self._items_by_name.get(item_name)
 
     def get_recipe(self, recipe_id: int) -> Optional[Recipe]:
         """Get recipe by ID."""
-        self.load()
         return self._recipes.get(recipe_id)
 
     def get_recipes_for_item(self, item_id: int) -> List[Recipe]:
         """Get all recipes that produce a given item."""
-        self.load()
         recipe_ids = self._recipes_by_output.get(item_id, [])
         return [self._recipes[rid] for rid in recipe_ids if rid in self._recipes]
 
     def get_building_speed(self, building_type: str, tier: str = "mk2") -> float:
         """Get production speed multiplier for a building."""
-        self.load()
         building_speeds = self._building_speeds.get(building_type, {})
         if isinstance(building_speeds, dict):
             return building_speeds.get(tier, 1.0)
@@ -217,18 +266,20 @@ class RecipeDatabase:
         building_tier: str = "mk2"
     ) -> float:
         """Calculate theoretical production rate in items/minute."""
-        recipe = self.get_recipe(recipe_id)
-        if not recipe:
-            return 0.0
+        key = (recipe_id, building_tier)
+        rate = self._rate_cache.get(key)
+        if rate is None:
+            recipe = self.get_recipe(recipe_id)
+            if not recipe:
+                return 0.0
 
-        speed = self.get_building_speed(recipe.building, building_tier)
-        return recipe.items_per_minute(speed) * building_count
+            speed = self.get_building_speed(recipe.building, building_tier)
+            rate = self._rate_cache[key] = recipe.items_per_minute(speed)
+        return rate * building_count
 
     def is_raw_resource(self, item_id: int) -> bool:
         """Check if an item is a raw resource (ore, water, oil, etc.)."""
-        self.load()
-        # Raw resources typically have IDs in the 1001-1031 range
-        return 1001 <= item_id <= 1031
+        return item_id in RAW_RESOURCE_IDS
 
     def build_dependency_graph(
         self,
@@ -256,12 +307,10 @@ class RecipeDatabase:
         depth: int
     ) -> DependencyNode:
         """Recursively build dependency node."""
-        item_name = self.get_item_name(item_id)
-
         node = DependencyNode(
             item_id=item_id,
-            item_name=item_name,
-            is_raw_resource=self.is_raw_resource(item_id)
+            item_name=self._items.get(item_id, f"item_{item_id}"),
+            is_raw_resource=item_id in RAW_RESOURCE_IDS
         )
 
         # Stop conditions
@@ -297,25 +346,34 @@ class RecipeDatabase:
             List of (item_id, item_name, recipe_id) tuples in dependency order
         """
         self.load()
+        cached = self._upstream_cache.get((item_id, max_depth))
+        if cached is not None:
+            return list(cached)
+
         result: List[Tuple[int, str, int]] = []
         visited: Set[int] = set()
+        items = self._items
 
-        def trace(iid: int, depth: int) -> None:
+        # Depth-first walk with an explicit stack; children are pushed in
+        # reverse so they are visited in recipe input order
+        stack: List[Tuple[int, int]] = [(item_id, max_depth)]
+        while stack:
+            iid, depth = stack.pop()
             if iid in visited or depth <= 0:
-                return
+                continue
             visited.add(iid)
 
             recipes = self.get_recipes_for_item(iid)
             if recipes:
                 recipe = recipes[0]
-                result.append((iid, self.get_item_name(iid), recipe.id))
+                result.append((iid, items.get(iid, f"item_{iid}"), recipe.id))
 
-                for inp in recipe.inputs:
-                    if not self.is_raw_resource(inp.item_id):
-                        trace(inp.item_id, depth - 1)
+                for inp in reversed(recipe.inputs):
+                    if inp.item_id not in RAW_RESOURCE_IDS:
+                        stack.append((inp.item_id, depth - 1))
 
-        trace(item_id, max_depth)
-        return result
+        self._upstream_cache[(item_id, max_depth)] = result
+        return list(result)
 
     def trace_bottleneck_downstream(
         self,
@@ -329,8 +387,15 @@ class RecipeDatabase:
             List of (item_id, item_name) tuples that use this item
         """
         self.load()
+        cached = self._downstream_cache.get((item_id, max_depth))
+        if cached is not None:
+            return list(cached)
+
         result: List[Tuple[int, str]] = []
         visited: Set[int] = set()
+        items = self._items
+        recipes = self._recipes
+        recipes_by_input = self._recipes_by_input
 
         def trace(iid: int, depth: int) -> None:
             if iid in visited or depth <= 0:
@@ -338,16 +403,15 @@ class RecipeDatabase:
             visited.add(iid)
 
             # Find recipes that use this item as input
-            for recipe in self._recipes.values():
-                for inp in recipe.inputs:
-                    if inp.item_id == iid:
-                        output_id = recipe.primary_output_id
-                        if output_id not in visited:
-                            result.append((output_id, self.get_item_name(output_id)))
-                            trace(output_id, depth - 1)
+            for recipe_id in recipes_by_input.get(iid, ()):
+                output_id = recipes[recipe_id].primary_output_id
+                if output_id not in visited:
+                    result.append((output_id, items.get(output_id, f"item_{output_id}")))
+                    trace(output_id, depth - 1)
 
         trace(item_id, max_depth)
-        return result
+        self._downstream_cache[(item_id, max_depth)] = result
+        return list(result)
 
     def get_production_chain(
         self,
@@ -356,14 +420,22 @@ class RecipeDatabase:
         """
         Get complete production chain for an item.
 
+        Chains are memoized per target item. Each call returns a deep copy,
+        so callers may modify the result without affecting the cache.
+
         Returns:
             Dict with production chain details
         """
         self.load()
+        cached = self._chain_cache.get(target_item_id)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        items = self._items
         chain: Dict[str, Any] = {
             "target": {
                 "item_id": target_item_id,
-                "item_name": self.get_item_name(target_item_id)
+                "item_name": items.get(target_item_id, f"item_{target_item_id}")
             },
             "steps": [],
             "raw_resources": []
@@ -372,14 +444,17 @@ class RecipeDatabase:
         visited: Set[int] = set()
         raw_resources: Set[int] = set()
 
-        def process(iid: int, level: int) -> None:
+        # Depth-first walk with an explicit stack (see trace_bottleneck_upstream)
+        stack: List[Tuple[int, int]] = [(target_item_id, 0)]
+        while stack:
+            iid, level = stack.pop()
             if iid in visited:
-                return
+                continue
             visited.add(iid)
 
-            if self.is_raw_resource(iid):
+            if iid in RAW_RESOURCE_IDS:
                 raw_resources.add(iid)
-                return
+                continue
 
             recipes = self.get_recipes_for_item(iid)
             if recipes:
@@ -387,7 +462,7 @@ class RecipeDatabase:
                 chain["steps"].append({
                     "level": level,
                     "item_id": iid,
-                    "item_name": self.get_item_name(iid),
+                    "item_name": items.get(iid, f"item_{iid}"),
                     "recipe_id": recipe.id,
                     "recipe_name": recipe.name,
                     "building": recipe.building,
@@ -402,27 +477,30 @@ class RecipeDatabase:
                     ]
                 })
 
-                for inp in recipe.inputs:
-                    process(inp.item_id, level + 1)
-
-        process(target_item_id, 0)
+                for inp in reversed(recipe.inputs):
+                    stack.append((inp.item_id, level + 1))
 
         chain["raw_resources"] = [
-            {"item_id": rid, "item_name": self.get_item_name(rid)}
+            {"item_id": rid, "item_name": items.get(rid, f"item_{rid}")}
             for rid in raw_resources
         ]
 
-        return chain
+        self._chain_cache[target_item_id] = chain
+        return copy.deepcopy(chain)
 
 
 # Singleton instance
 _database: Optional[RecipeDatabase] = None
+_database_lock = threading.Lock()
 
 
 def get_recipe_database() -> RecipeDatabase:
-    """Get the singleton recipe database instance."""
+    """Get the singleton recipe database instance (loaded)."""
     global _database
     if _database is None:
-        _database = RecipeDatabase()
-        _database.load()
+        with _database_lock:
+            if _database is None:
+                database = RecipeDatabase()
+                database.load()
+                _database = database
     return _database
@@ -2,13 +2,7 @@
 
 import pytest
 from datetime import datetime
-from unittest.mock import MagicMock
-
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from types import SimpleNamespace
 
 from mcp_server.models.factory_state import (
     FactoryState,
@@ -17,56 +11,66 @@ from mcp_server.models.factory_state import (
     AssemblerMetrics,
     PowerMetrics,
     BeltMetrics,
-    ENERGY_PER_TICK_TO_MW,
 )
 
 
 class TestItemMetrics:
     """Tests for ItemMetrics dataclass."""
 
-    def test_net_rate_calculation(self):
+    @pytest.mark.parametrize("production,consumption,expected", [
+        (100.0, 60.0, 40.0),
+        (30.0, 50.0, -20.0),  # consumption exceeds production
+    ])
+    def test_net_rate_calculation(self, production, consumption, expected):
         """Net rate should be production minus consumption."""
         metrics = ItemMetrics(
             item_name="iron-ingot",
-            production_rate=100.0,
-            consumption_rate=60.0,
+            production_rate=production,
+            consumption_rate=consumption,
             current_storage=500,
         )
-        assert metrics.net_rate == 40.0
+        assert metrics.net_rate == expected
 
-    def test_negative_net_rate(self):
-        """Net rate can be negative when consumption exceeds production."""
+    def test_net_rate_follows_updates(self):
+        """Net rate reflects rates changed after construction."""
         metrics = ItemMetrics(
-            item_name="copper-ingot",
-            production_rate=30.0,
-            consumption_rate=50.0,
-            current_storage=100,
+            item_name="iron-ingot",
+            production_rate=10.0,
+            consumption_rate=5.0,
+            current_storage=0,
+        )
+        metrics.production_rate += 10.0
+        assert metrics.net_rate == 15.0
+
+    def test_uses_slots(self):
+        """Metrics instances have no per-instance __dict__."""
+        metrics = ItemMetrics(
+            item_name="iron-ingot",
+            production_rate=1.0,
+            consumption_rate=0.0,
+            current_storage=0,
         )
-        assert metrics.net_rate == -20.0
+        assert not hasattr(metrics, "__dict__")
+        with pytest.raises(AttributeError):
+            metrics.unknown = 1
 
 
 class TestAssemblerMetrics:
     """Tests for AssemblerMetrics dataclass."""
 
-    def test_efficiency_calculation(self):
-        """Efficiency should be actual/theoretical * 100."""
+    @pytest.mark.parametrize("theoretical_max,expected", [
+        (60.0, 75.0),
+        (0.0, 0.0),  # no theoretical max
+    ])
+    def test_efficiency_calculation(self, theoretical_max, expected):
+        """Efficiency should be actual/theoretical * 100, or 0 without a max."""
         metrics = AssemblerMetrics(
             assembler_id=1,
             recipe_id=10,
             production_rate=45.0,
-            theoretical_max=60.0,
+            theoretical_max=theoretical_max,
         )
-        assert metrics.efficiency == 75.0
-
-    def test_efficiency_zero_theoretical(self):
-        """Efficiency should be 0 when theoretical_max is 0."""
-        metrics = AssemblerMetrics(
-            assembler_id=1,
-            recipe_id=10,
-            production_rate=45.0,
-            theoretical_max=0.0,
-        )
-        assert metrics.efficiency == 0.0
+        assert metrics.efficiency == expected
 
     def test_input_starved_flag(self):
         """Input starved flag should be stored correctly."""
@@ -84,21 +88,17 @@ class TestAssemblerMetrics:
 class TestPowerMetrics:
     """Tests for PowerMetrics dataclass."""
 
-    def test_surplus_calculation(self):
+    @pytest.mark.parametrize("generation,consumption,expected", [
+        (100.0, 80.0, 20.0),
+        (50.0, 75.0, -25.0),  # deficit
+    ])
+    def test_surplus_calculation(self, generation, consumption, expected):
         """Surplus should be generation minus consumption."""
         metrics = PowerMetrics(
-            generation_mw=100.0,
-            consumption_mw=80.0,
+            generation_mw=generation,
+            consumption_mw=consumption,
         )
-        assert metrics.surplus_mw == 20.0
-
-    def test_deficit_calculation(self):
-        """Surplus can be negative (deficit)."""
-        metrics = PowerMetrics(
-            generation_mw=50.0,
-            consumption_mw=75.0,
-        )
-        assert metrics.surplus_mw == -25.0
+        assert metrics.surplus_mw == expected
 
     def test_accumulator_charge(self):
         """Accumulator charge percent should be stored."""
@@ -113,25 +113,19 @@ class TestPowerMetrics:
 class TestBeltMetrics:
     """Tests for BeltMetrics dataclass."""
 
-    def test_saturation_calculation(self):
-        """Saturation should be throughput/max * 100."""
+    @pytest.mark.parametrize("throughput,max_throughput,expected", [
+        (27.0, 30.0, 90.0),
+        (10.0, 0.0, 0.0),  # no max throughput
+    ])
+    def test_saturation_calculation(self, throughput, max_throughput, expected):
+        """Saturation should be throughput/max * 100, or 0 without a max."""
         metrics = BeltMetrics(
             belt_id=1,
             item_type="iron-ore",
-            throughput=27.0,
-            max_throughput=30.0,
+            throughput=throughput,
+            max_throughput=max_throughput,
         )
-        assert metrics.saturation_percent == 90.0
-
-    def test_saturation_zero_max(self):
-        """Saturation should be 0 when max is 0."""
-        metrics = BeltMetrics(
-            belt_id=1,
-            item_type="iron-ore",
-            throughput=10.0,
-            max_throughput=0.0,
-        )
-        assert metrics.saturation_percent == 0.0
+        assert metrics.saturation_percent == expected
 
 
 class TestPlanetState:
@@ -163,7 +157,7 @@ class TestFactoryState:
 
     def test_empty_factory(self):
         """Factory can be created empty."""
-        state = FactoryState(timestamp=datetime.now())
+        state = FactoryState(timestamp=datetime(2024, 1, 1))
         assert len(state.planets) == 0
 
     def test_from_realtime_data_empty(self):
@@ -206,40 +200,143 @@ class TestFactoryState:
         assert "iron-ingot" in planet.production
         assert planet.production["iron-ingot"].net_rate == 60.0
 
+    def test_from_realtime_data_aggregates_same_recipe(self):
+        """Rows for the same recipe are summed into one ItemMetrics."""
+        data = {
+            "planets": {
+                "1": {
+                    "production": [
+                        {"recipeId": 1, "assemblerId": 1, "productionRate": 30.0, "storage": 2},
+                        {"recipeId": 1, "assemblerId": 2, "productionRate": 30.0, "storage": 3},
+                        {"recipeId": 2, "assemblerId": 3, "productionRate": 10.0},
+                    ],
+                }
+            },
+        }
+        planet = FactoryState.from_realtime_data(data).planets[1]
+
+        assert set(planet.production) == {"recipe_1", "recipe_2"}
+        assert planet.production["recipe_1"].production_rate == 60.0
+        assert planet.production["recipe_1"].current_storage == 5
+        assert len(planet.assemblers) == 3
+
+    def test_from_realtime_data_timestamp(self):
+        """Numeric timestamps are used; missing or invalid ones fall back to now."""
+        state = FactoryState.from_realtime_data({"timestamp": 1703520000})
+        assert state.timestamp == datetime.fromtimestamp(1703520000)
+
+        before = datetime.now()
+        for value in (0, None, "soon"):
+            assert FactoryState.from_realtime_data({"timestamp": value}).timestamp >= before
+
+    def test_from_realtime_json(self):
+        """from_realtime_json decodes text and bytes payloads."""
+        payload = '{"timestamp": 1703520000, "planets": {"1": {"planetName": "Home"}}}'
+        for raw in (payload, payload.encode()):
+            state = FactoryState.from_realtime_json(raw)
+            assert state.planets[1].planet_name == "Home"
+
+    def test_from_realtime_json_selected_planets(self):
+        """Only requested planets are built."""
+        payload = (
+            '{"planets": {"1": {"planetName": "A"}, "2": {"planetName": "B"},'
+            ' "3": {"planetName": "C"}}}'
+        )
+        state = FactoryState.from_realtime_json(payload, planet_ids={2})
+        assert list(state.planets) == [2]
+        assert state.planets[2].planet_name == "B"
+
+    def test_from_realtime_json_invalid(self):
+        """Malformed payloads raise ValueError."""
+        with pytest.raises(ValueError):
+            FactoryState.from_realtime_json(b"{broken")
+
+    def test_from_realtime_data_reuses_item_names(self):
+        """Generated item names are shared between frames."""
+        data = {"planets": {"1": {"belts": [{"beltId": 1, "itemType": 1101}]}}}
+        first = FactoryState.from_realtime_data(data).planets[1].belts[0]
+        second = FactoryState.from_realtime_data(data).planets[1].belts[0]
+        assert first.item_type == "item_1101"
+        assert first.item_type is second.item_type
+
+    def test_from_realtime_data_legacy_belts(self):
+        """PascalCase belt rows are parsed like camelCase ones."""
+        data = {
+            "Planets": {
+                "1": {"Belts": [{"BeltId": 7, "ItemType": 1101, "Throughput": 15.0}]},
+            },
+        }
+        belt = FactoryState.from_realtime_data(data).planets[1].belts[0]
+
+        assert belt.belt_id == 7
+        assert belt.item_type == "item_1101"
+        assert belt.saturation_percent == 50.0
+
+
+class TestFactoryStateApplyDelta:
+    """Tests for FactoryState.apply_delta()."""
+
+    @pytest.fixture
+    def base_state(self):
+        return FactoryState.from_realtime_data({
+            "timestamp": 1703520000,
+            "planets": {
+                "1": {"planetName": "Alpha"},
+                "2": {"planetName": "Beta"},
+                "3": {"planetName": "Gamma"},
+            },
+        })
+
+    def test_apply_delta_replaces_changed_planets(self, base_state):
+        """Changed planets are replaced, others are shared."""
+        delta = {
+            "type": "delta",
+            "seq": 2,
+            "timestamp": 1703520001,
+            "planets": {"2": {"planetName": "Beta Prime"}},
+        }
+        state = FactoryState.apply_delta(base_state, delta)
+
+        assert state.planets[2].planet_name == "Beta Prime"
+        assert state.planets[1] is base_state.planets[1]
+        assert state.timestamp == datetime.fromtimestamp(1703520001)
+        # Previous state is untouched
+        assert base_state.planets[2].planet_name == "Beta"
+
+    def test_apply_delta_removes_planets(self, base_state):
+        """Removed planet IDs are dropped."""
+        delta = {"type": "delta", "seq": 2, "planets": {}, "removed": [3]}
+        state = FactoryState.apply_delta(base_state, delta)
+
+        assert set(state.planets) == {1, 2}
+
 
 class TestFactoryStateFromSaveData:
     """Tests for FactoryState.from_save_data()."""
 
     def test_from_save_data_with_mock(self):
         """from_save_data extracts data from GameSave-like object."""
-        # Create mock GameSave structure
-        mock_generator = MagicMock()
-        mock_generator.id = 1
-        mock_generator.genEnergyPerTick = 1000000  # ~60 MW
-
-        mock_consumer = MagicMock()
-        mock_consumer.id = 1
-        mock_consumer.workEnergyPerTick = 500000  # ~30 MW
-
-        mock_power_system = MagicMock()
-        mock_power_system.genPool = [mock_generator]
-        mock_power_system.consumerPool = [mock_consumer]
-        mock_power_system.accPool = []
-
-        mock_factory = MagicMock()
-        mock_factory.planetId = 1
-        mock_factory.powerSystem = mock_power_system
-        mock_factory.factorySystem = MagicMock(assemblerPool=[])
+        # Build a GameSave-like structure
+        generator = SimpleNamespace(id=1, genEnergyPerTick=1000000)  # ~60 MW
+        consumer = SimpleNamespace(id=1, workEnergyPerTick=500000)  # ~30 MW
+
+        power_system = SimpleNamespace(
+            genPool=[generator],
+            consumerPool=[consumer],
+            accPool=[],
+        )
 
-        mock_game_data = MagicMock()
-        mock_game_data.factories = [mock_factory]
-        mock_game_data.statistics = None
+        factory = SimpleNamespace(
+            planetId=1,
+            powerSystem=power_system,
+            factorySystem=SimpleNamespace(assemblerPool=[]),
+        )
 
-        mock_game_save = MagicMock()
-        mock_game_save.gameData = mock_game_data
+        game_data = SimpleNamespace(factories=[factory], statistics=None)
+        game_save = SimpleNamespace(gameData=game_data)
 
         # Parse
-        state = FactoryState.from_save_data(mock_game_save)
+        state = FactoryState.from_save_data(game_save)
 
         # Verify
         assert len(state.planets) == 1
@@ -255,11 +352,40 @@ class TestFactoryStateFromSaveData:
 
     def test_from_save_data_handles_missing_attributes(self):
         """from_save_data handles GameSave with missing optional attributes."""
-        mock_game_data = MagicMock()
-        mock_game_data.factories = []
+        # No statistics attribute
+        game_save = SimpleNamespace(gameData=SimpleNamespace(factories=[]))
 
-        mock_game_save = MagicMock()
-        mock_game_save.gameData = mock_game_data
-
-        state = FactoryState.from_save_data(mock_game_save)
+        state = FactoryState.from_save_data(game_save)
         assert len(state.planets) == 0
+
+    def test_extract_power_metrics_skips_incomplete_entries(self):
+        """Pool entries that are empty or missing fields are ignored."""
+        power_system = SimpleNamespace(
+            genPool=[
+                SimpleNamespace(id=1, genEnergyPerTick=1_000_000),
+                SimpleNamespace(id=0, genEnergyPerTick=1_000_000),
+                SimpleNamespace(id=2),
+            ],
+            consumerPool=[SimpleNamespace(id=1, workEnergyPerTick=500_000)],
+            accPool=[
+                SimpleNamespace(id=1, curEnergy=25, maxEnergy=100),
+                SimpleNamespace(id=0, curEnergy=50, maxEnergy=100),
+            ],
+        )
+        power = FactoryState._extract_power_metrics(power_system)
+
+        assert power.generation_mw == pytest.approx(60.0)
+        assert power.consumption_mw == pytest.approx(30.0)
+        assert power.accumulator_charge_percent == pytest.approx(25.0)
+
+    def test_extract_assembler_metrics_skips_idle_entries(self):
+        """Empty slots and assemblers without a recipe are skipped."""
+        factory_system = SimpleNamespace(assemblerPool=[
+            SimpleNamespace(id=1, recipeId=5),
+            SimpleNamespace(id=0, recipeId=5),
+            SimpleNamespace(id=2, recipeId=0),
+            SimpleNamespace(id=3),
+        ])
+        assemblers = FactoryState._extract_assembler_metrics(factory_system)
+
+        assert [(a.assembler_id, a.recipe_id) for a in assemblers] == [(1, 5)]
@@ -0,0 +1,416 @@
+"""Tests for RealTimeStream."""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from mcp_server.data_sources.realtime_stream import RealTimeStream
+from mcp_server.models.factory_state import FactoryState
+
+
+def _publish(stream: RealTimeStream, state: FactoryState) -> None:
+    """Simulate the receive loop delivering a state update."""
+    stream.latest_state = state
+    stream._last_message_time = time.monotonic()
+    stream._state_event.set()
+    stream._state_event.clear()
+
+
+class FakeWebSocket:
+    """Async-iterable stand-in for a websockets connection."""
+
+    def __init__(self, messages, delay: float = 0.0):
+        self._messages = list(messages)
+        self._delay = delay
+        self.sent = []
+        self.closed = False
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        if not self._messages:
+            raise StopAsyncIteration
+        return self._messages.pop(0)
+
+
+def _frame(timestamp: float) -> str:
+    """Build a minimal realtime JSON frame."""
+    return '{"timestamp": %r, "planets": {"1": {"planetName": "P"}}}' % timestamp
+
+
+async def _run_receive_loop(stream: RealTimeStream, messages, delay: float = 0.0) -> None:
+    """Feed messages through the receive loop without reconnecting."""
+    stream.websocket = FakeWebSocket(messages, delay)
+    stream._should_reconnect = False
+    await stream._receive_loop()
+
+
+class TestDecodeMessage:
+    """Tests for RealTimeStream._decode_message()."""
+
+    def test_decode_json_text_frame(self):
+        """Text frames are decoded as JSON."""
+        data = RealTimeStream._decode_message('{"timestamp": 1703520000, "planets": {}}')
+        assert data["timestamp"] == 1703520000
+        assert data["planets"] == {}
+
+    def test_decode_msgpack_binary_frame(self):
+        """Binary frames are decoded as msgpack."""
+        msgpack = pytest.importorskip("msgpack")
+        payload = msgpack.packb({"timestamp": 1703520000.5, "planets": {"1": {"planetId": 1}}})
+        data = RealTimeStream._decode_message(payload)
+        assert data["timestamp"] == 1703520000.5
+        assert data["planets"]["1"]["planetId"] == 1
+
+    def test_decode_invalid_json_raises_value_error(self):
+        """Malformed payloads raise ValueError."""
+        with pytest.raises(ValueError):
+            RealTimeStream._decode_message("{not json")
+
+
+class TestStateWaiting:
+    """Tests for event-driven state waiting."""
+
+    @pytest.fixture
+    def stream(self):
+        stream = RealTimeStream()
+        stream._connected = True
+        return stream
+
+    async def test_get_current_state_wakes_on_update(self, stream):
+        """get_current_state returns as soon as the first state arrives."""
+        state = FactoryState(timestamp=datetime.now())
+        asyncio.get_running_loop().call_later(0.01, _publish, stream, state)
+
+        result = await stream.get_current_state(timeout=1.0)
+        assert result is state
+
+    async def test_get_current_state_timeout(self, stream):
+        """get_current_state raises TimeoutError when no data arrives."""
+        with pytest.raises(TimeoutError, match="No data received"):
+            await stream.get_current_state(timeout=0.01)
+
+    async def test_wait_for_fresh_state_waits_for_new_update(self, stream):
+        """Stale state is skipped until a fresh update is published."""
+        stale = FactoryState(timestamp=datetime.now())
+        stream.latest_state = stale
+        stream._last_message_time = time.monotonic() - 10
+
+        fresh = FactoryState(timestamp=datetime.now())
+        asyncio.get_running_loop().call_later(0.01, _publish, stream, fresh)
+
+        result = await stream.wait_for_fresh_state(max_age_ms=1000, timeout=1.0)
+        assert result is fresh
+
+    async def test_wait_for_fresh_state_timeout(self, stream):
+        """wait_for_fresh_state raises TimeoutError without fresh data."""
+        with pytest.raises(TimeoutError, match="No fresh data"):
+            await stream.wait_for_fresh_state(timeout=0.01)
+
+    @pytest.mark.parametrize("method", ["get_current_state", "wait_for_fresh_state"])
+    async def test_slow_connect_is_bounded_by_timeout(self, method):
+        """A connect slower than the caller's timeout fails within the timeout."""
+        stream = RealTimeStream()
+
+        async def slow_open():
+            await asyncio.sleep(10)
+
+        with patch.object(stream, "_open_connection", side_effect=slow_open):
+            start = time.monotonic()
+            with pytest.raises(ConnectionError):
+                await getattr(stream, method)(timeout=0.05)
+
+        assert time.monotonic() - start < 1.0
+        assert not stream._connected
+
+
+class TestReceiveLoop:
+    """Tests for RealTimeStream._receive_loop()."""
+
+    async def test_updates_latest_state(self):
+        """Each frame replaces latest_state."""
+        stream = RealTimeStream()
+        await _run_receive_loop(stream, [_frame(1.0), _frame(2.0)])
+        assert stream.latest_state is not None
+        assert stream.latest_state.planets[1].planet_name == "P"
+
+    async def test_invalid_frame_is_skipped(self):
+        """Malformed frames do not stop the loop."""
+        stream = RealTimeStream()
+        await _run_receive_loop(stream, ["{broken", _frame(1.0)], delay=0.01)
+        assert stream.latest_state is not None
+
+    async def test_callbacks_are_coalesced(self):
+        """Bursts of frames trigger at most one callback per interval."""
+        stream = RealTimeStream()
+        received = []
+        stream.set_state_callback(received.append)
+
+        await _run_receive_loop(stream, [_frame(float(i)) for i in range(10)], delay=0.001)
+
+        assert 1 <= len(received) < 10
+
+    async def test_burst_keeps_newest_frame(self):
+        """When frames arrive faster than they are parsed, only the newest is kept."""
+        stream = RealTimeStream()
+        frames = [
+            '{"timestamp": %d, "planets": {"1": {"planetName": "P%d"}}}' % (i, i)
+            for i in range(10)
+        ]
+        with patch.object(
+            FactoryState, "from_realtime_data", wraps=FactoryState.from_realtime_data
+        ) as from_realtime:
+            await _run_receive_loop(stream, frames)
+
+        assert stream.latest_state.planets[1].planet_name == "P9"
+        assert from_realtime.call_count < 10
+        assert stream.get_connection_status()["dropped_frames"] == 10 - from_realtime.call_count
+
+    async def test_unchanged_planets_are_reused(self):
+        """Full frames only rebuild planets whose data changed."""
+        stream = RealTimeStream()
+        planets = '{"1": {"planetName": "A"}, "2": {"planetName": "%s"}}'
+        first = '{"timestamp": 1.0, "planets": %s}' % (planets % "B")
+        second = '{"timestamp": 2.0, "planets": %s}' % (planets % "C")
+        await _run_receive_loop(stream, [first], delay=0.01)
+        previous = stream.latest_state
+
+        await _run_receive_loop(stream, [second], delay=0.01)
+        state = stream.latest_state
+
+        assert state is not previous
+        assert state.planets[1] is previous.planets[1]
+        assert state.planets[2].planet_name == "C"
+        assert previous.planets[2].planet_name == "B"
+
+    async def test_malformed_planet_keeps_last_state(self):
+        """A frame whose planets cannot be built is dropped before publishing."""
+        stream = RealTimeStream()
+        bad = '{"timestamp": 2.0, "planets": {"1": {"production": [{"recipeId": "x"}]}}}'
+        await _run_receive_loop(stream, [_frame(1.0), bad], delay=0.01)
+
+        assert stream.latest_state.planets[1].planet_name == "P"
+        assert stream._last_game_timestamp == 1.0
+
+    async def test_changed_planets_rebuild(self):
+        """A change in planet data rebuilds the state."""
+        stream = RealTimeStream()
+        changed = '{"timestamp": 2.0, "planets": {"1": {"planetName": "Q"}}}'
+        await _run_receive_loop(stream, [_frame(1.0), changed], delay=0.01)
+        assert stream.latest_state.planets[1].planet_name == "Q"
+
+
+class TestStandbyConnection:
+    """Tests for warm standby promotion."""
+
+    async def test_promote_standby(self):
+        """A warm standby becomes the active connection."""
+        stream = RealTimeStream()
+        stream._should_reconnect = False
+        standby = FakeWebSocket([_frame(1.0)])
+        drain_task = asyncio.create_task(asyncio.sleep(10))
+        stream._standby = [(standby, drain_task)]
+
+        assert await stream._promote_standby() is True
+        assert stream.websocket is standby
+        assert stream._standby == []
+        assert drain_task.cancelled()
+
+        await stream._receive_task
+        assert stream.latest_state is not None
+
+    async def test_promote_skips_closed_standby(self):
+        """Standbys whose drain task already finished are discarded."""
+        stream = RealTimeStream()
+        stream._should_reconnect = False
+        closed_task = asyncio.create_task(asyncio.sleep(0))
+        await closed_task
+        stream._standby = [(FakeWebSocket([]), closed_task)]
+
+        assert await stream._promote_standby() is False
+        assert stream.websocket is None
+
+
+class TestSupervisor:
+    """Tests for the reconnection supervisor."""
+
+    async def test_disconnect_promotes_standby(self):
+        """A disconnect wakes the supervisor, which promotes a standby."""
+        stream = RealTimeStream()
+        stream.POOL_SIZE = 1  # don't open new standbys
+        standby = FakeWebSocket([])
+        stream._standby = [(standby, asyncio.create_task(asyncio.sleep(10)))]
+
+        stream._ensure_supervisor()
+        stream._disconnect_event.set()
+        await asyncio.sleep(0.01)
+
+        assert stream.websocket is standby
+        await stream.close()
+
+    async def test_close_stops_supervisor(self):
+        """close() cancels the supervisor task."""
+        stream = RealTimeStream()
+        stream._ensure_supervisor()
+        supervisor = stream._supervisor_task
+
+        await stream.close()
+
+        assert supervisor.done()
+
+
+class TestDeltaFrames:
+    """Tests for delta frame handling."""
+
+    async def test_delta_applied_in_sequence(self):
+        """Consecutive deltas update only the changed planets."""
+        stream = RealTimeStream()
+        frames = [
+            '{"seq": 1, "planets": {"1": {"planetName": "A"}, "2": {"planetName": "B"}}}',
+            '{"type": "delta", "seq": 2, "planets": {"2": {"planetName": "B2"}}}',
+        ]
+        await _run_receive_loop(stream, frames, delay=0.01)
+
+        assert stream.latest_state.planets[1].planet_name == "A"
+        assert stream.latest_state.planets[2].planet_name == "B2"
+        assert stream.websocket.sent == []
+
+    async def test_delta_backlog_is_applied_in_order(self):
+        """Deltas queued while parsing is behind are all applied, not dropped."""
+        stream = RealTimeStream()
+        frames = ['{"seq": 1, "planets": {"1": {"planetName": "A"}, "2": {"planetName": "B"}}}']
+        frames += [
+            '{"type": "delta", "seq": %d, "planets": {"%d": {"planetName": "X%d"}}}'
+            % (seq, seq % 2 + 1, seq)
+            for seq in range(2, 12)
+        ]
+        await _run_receive_loop(stream, frames)
+
+        assert stream.latest_state.planets[1].planet_name == "X10"
+        assert stream.latest_state.planets[2].planet_name == "X11"
+        assert stream.websocket.sent == []
+        assert stream._last_seq == 11
+
+    async def test_full_frame_supersedes_backlog(self):
+        """A full frame in the backlog skips everything queued before it."""
+        stream = RealTimeStream()
+        frames = [
+            '{"seq": 1, "planets": {"1": {"planetName": "A"}}}',
+            "{broken",
+            '{"type": "delta", "seq": 2, "planets": {"1": {"planetName": "A2"}}}',
+            '{"seq": 7, "planets": {"1": {"planetName": "B"}}}',
+            '{"type": "delta", "seq": 8, "planets": {"1": {"planetName": "B8"}}}',
+        ]
+        await _run_receive_loop(stream, frames)
+
+        assert stream.latest_state.planets[1].planet_name == "B8"
+        assert stream.websocket.sent == []
+
+    async def test_delta_gap_requests_resync(self):
+        """A missed delta is discarded and a single resync is requested."""
+        stream = RealTimeStream()
+        frames = [
+            '{"seq": 1, "planets": {"1": {"planetName": "A"}}}',
+            '{"type": "delta", "seq": 3, "planets": {"1": {"planetName": "A3"}}}',
+            '{"type": "delta", "seq": 4, "planets": {"1": {"planetName": "A4"}}}',
+        ]
+        await _run_receive_loop(stream, frames, delay=0.01)
+
+        assert stream.latest_state.planets[1].planet_name == "A"
+        assert stream.websocket.sent == [RealTimeStream.RESYNC_REQUEST]
+
+
+class TestLatency:
+    """Tests for RealTimeStream.latency_ms."""
+
+    def test_latency_from_ping(self):
+        """Ping round-trip time is preferred when available."""
+        stream = RealTimeStream()
+        stream.websocket = FakeWebSocket([])
+        stream.websocket.latency = 0.025
+        assert stream.latency_ms == pytest.approx(25.0)
+
+    def test_latency_falls_back_to_game_timestamp(self):
+        """Without a pong yet, latency comes from the frame timestamp."""
+        stream = RealTimeStream()
+        stream._last_message_time = time.monotonic()
+        stream._last_game_timestamp = time.time() - 0.1
+        assert stream.latency_ms == pytest.approx(100.0, abs=20.0)
+
+    def test_latency_without_data(self):
+        """Latency is 0 before any data arrives."""
+        assert RealTimeStream().latency_ms == 0.0
+
+
+class TestSetAddress:
+    """Tests for RealTimeStream.set_address()."""
+
+    async def test_set_address_updates_uri(self):
+        """A new host/port rebuilds the URI."""
+        stream = RealTimeStream()
+        assert await stream.set_address("192.168.1.5", 9000) is True
+        assert stream.uri == "ws://192.168.1.5:9000"
+
+    async def test_set_address_unchanged(self):
+        """The same host/port reports no change."""
+        stream = RealTimeStream("localhost", 8470)
+        assert await stream.set_address("localhost", 8470) is False
+
+    async def test_set_address_resets_parse_state_after_inflight_parse(self):
+        """A parse still running for the old game cannot restore its sequence."""
+        stream = RealTimeStream()
+        stream._last_seq = 4
+
+        def finish_old_frame():
+            time.sleep(0.05)
+            stream._last_seq = 5
+            stream._last_planets_data = {"1": {}}
+
+        loop = asyncio.get_running_loop()
+        inflight = loop.run_in_executor(stream._get_parse_executor(), finish_old_frame)
+        await stream.set_address("10.0.0.2", 9000)
+        await inflight
+
+        assert stream._last_seq is None
+        assert stream._last_planets_data is None
+        await stream.close()
+
+    async def test_set_address_drops_old_connections(self):
+        """Changing the address of a connected stream reconnects to the new one."""
+        stream = RealTimeStream()
+        stream.POOL_SIZE = 1  # don't open new standbys
+        old = FakeWebSocket([_frame(1.0)] * 100, delay=10)
+        stream.websocket = old
+        stream._connected = True
+        stream._receive_task = asyncio.create_task(stream._receive_loop())
+        standby = FakeWebSocket([])
+        standby_drain = asyncio.create_task(asyncio.sleep(10))
+        stream._standby = [(standby, standby_drain)]
+        stream.latest_state = FactoryState(timestamp=datetime.now())
+
+        assert await stream.set_address("10.0.0.2", 9000) is True
+
+        assert not stream._connected
+        assert old.closed and standby.closed
+        assert standby_drain.cancelled()
+        assert stream._standby == []
+        assert stream.latest_state is None
+
+        new = FakeWebSocket([], delay=10)
+        with patch.object(stream, "_open_connection", return_value=new) as open_connection:
+            assert await stream.connect() is True
+
+        open_connection.assert_called_once()
+        assert stream.websocket is new
+        await stream.close()
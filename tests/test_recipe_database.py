@@ -1,13 +1,9 @@
 """Tests for RecipeDatabase."""
 
+import threading
 import pytest
-from pathlib import Path
-import sys
+from unittest.mock import patch
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from mcp_server.utils import recipe_database
 from mcp_server.utils.recipe_database import (
     RecipeDatabase,
     Recipe,
@@ -18,12 +14,31 @@ from mcp_server.utils.recipe_database import (
 )
 
 
-@pytest.fixture(autouse=True)
-def reset_database_singleton():
-    """Reset the singleton database between tests."""
-    recipe_database._database = None
-    yield
-    recipe_database._database = None
+@pytest.fixture(scope="module")
+def db():
+    """Shared, loaded recipe database."""
+    return get_recipe_database()
+
+
+# Iron Ingot (1101) walks, computed once and shared by the graph tests
+@pytest.fixture(scope="module")
+def iron_ingot_graph(db):
+    return db.build_dependency_graph(1101, max_depth=2)
+
+
+@pytest.fixture(scope="module")
+def iron_ingot_upstream(db):
+    return db.trace_bottleneck_upstream(1101, max_depth=2)
+
+
+@pytest.fixture(scope="module")
+def iron_ingot_downstream(db):
+    return db.trace_bottleneck_downstream(1101, max_depth=3)
+
+
+@pytest.fixture(scope="module")
+def iron_ingot_chain(db):
+    return db.get_production_chain(1101)
 
 
 class TestRecipeDatabase:
@@ -35,63 +50,74 @@ class TestRecipeDatabase:
         db2 = get_recipe_database()
         assert db1 is db2
 
-    def test_load_items(self):
+    def test_database_uses_slots(self):
+        """RecipeDatabase instances have no per-instance __dict__."""
+        db = RecipeDatabase()
+        assert not hasattr(db, "__dict__")
+
+    def test_concurrent_load_runs_once(self):
+        """Concurrent load() calls only read the data files once."""
+        db = RecipeDatabase()
+        with patch.object(
+            RecipeDatabase, "_load_items", autospec=True, side_effect=RecipeDatabase._load_items
+        ) as load_items:
+            threads = [threading.Thread(target=db.load) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert load_items.call_count == 1
+        assert db.get_item_name(1001) != "item_1001"
+
+    def test_load_items(self, db):
         """Database loads item IDs."""
-        db = get_recipe_database()
         # Iron Ore should exist (using actual format from item_ids.json)
         assert db.get_item_name(1001) == "iron-ore"
         # Copper Ore
         assert db.get_item_name(1002) == "copper-ore"
 
-    def test_load_recipes(self):
+    def test_load_recipes(self, db):
         """Database loads recipes."""
-        db = get_recipe_database()
         # Iron Ingot recipe (ID 1)
         recipe = db.get_recipe(1)
         assert recipe is not None
         assert recipe.name == "Iron Ingot"
         assert recipe.building == "smelter"
 
-    def test_get_item_name_unknown(self):
+    def test_get_item_name_unknown(self, db):
         """Unknown item returns placeholder name."""
-        db = get_recipe_database()
         name = db.get_item_name(99999)
         assert name == "item_99999"
 
-    def test_get_item_id(self):
+    def test_get_item_id(self, db):
         """Can look up item ID by name."""
-        db = get_recipe_database()
         iron_ore_id = db.get_item_id("iron-ore")
         assert iron_ore_id == 1001
 
-    def test_get_item_id_unknown(self):
+    def test_get_item_id_unknown(self, db):
         """Unknown item name returns None."""
-        db = get_recipe_database()
         assert db.get_item_id("Nonexistent Item") is None
 
-    def test_get_recipe_unknown(self):
+    def test_get_recipe_unknown(self, db):
         """Unknown recipe returns None."""
-        db = get_recipe_database()
         assert db.get_recipe(99999) is None
 
-    def test_recipe_primary_output(self):
+    def test_recipe_primary_output(self, db):
         """Recipe has primary output."""
-        db = get_recipe_database()
         recipe = db.get_recipe(1)  # Iron Ingot
         assert recipe is not None
         assert recipe.primary_output_id == 1101  # Iron Ingot item ID
 
-    def test_recipe_items_per_minute(self):
+    def test_recipe_items_per_minute(self, db):
         """Recipe calculates items per minute."""
-        db = get_recipe_database()
         recipe = db.get_recipe(1)  # Iron Ingot, 1s cycle
         assert recipe is not None
         # 60 seconds / 1 second per cycle = 60 items per minute
         assert recipe.items_per_minute(1.0) == 60.0
 
-    def test_recipe_input_requirements(self):
+    def test_recipe_input_requirements(self, db):
         """Recipe calculates input requirements."""
-        db = get_recipe_database()
         recipe = db.get_recipe(1)  # Iron Ingot
         assert recipe is not None
         reqs = recipe.input_requirements_per_minute(1.0)
@@ -99,25 +125,22 @@ class TestRecipeDatabase:
         assert 1001 in reqs
         assert reqs[1001] == 60.0  # 60 iron ore per minute
 
-    def test_get_recipes_for_item(self):
+    def test_get_recipes_for_item(self, db):
         """Can find recipes that produce an item."""
-        db = get_recipe_database()
         # Iron Ingot (1101)
         recipes = db.get_recipes_for_item(1101)
         assert len(recipes) >= 1
         assert recipes[0].name == "Iron Ingot"
 
-    def test_is_raw_resource(self):
+    def test_is_raw_resource(self, db):
         """Raw resources are identified correctly."""
-        db = get_recipe_database()
         # Iron Ore is raw (1001-1031 range)
         assert db.is_raw_resource(1001) is True
         # Iron Ingot is not raw
         assert db.is_raw_resource(1101) is False
 
-    def test_calculate_theoretical_rate(self):
+    def test_calculate_theoretical_rate(self, db):
         """Theoretical production rate calculated correctly."""
-        db = get_recipe_database()
         # 1 smelter making iron ingots
         rate = db.calculate_theoretical_rate(1, building_count=1)
         assert rate > 0
@@ -125,71 +148,106 @@ class TestRecipeDatabase:
         rate2 = db.calculate_theoretical_rate(1, building_count=2)
         assert rate2 == rate * 2
 
+    def test_calculate_theoretical_rate_cached_per_tier(self, db):
+        """Per-building rates are cached by recipe and tier."""
+        mk1 = db.calculate_theoretical_rate(1, building_tier="mk1")
+        mk2 = db.calculate_theoretical_rate(1, building_tier="mk2")
+        assert db._rate_cache[(1, "mk1")] == mk1
+        assert db._rate_cache[(1, "mk2")] == mk2
+        assert db.calculate_theoretical_rate(999999) == 0.0
+
 
 class TestDependencyGraph:
     """Tests for dependency graph building."""
 
-    def test_build_dependency_graph_simple(self):
+    def test_build_dependency_graph_simple(self, iron_ingot_graph):
         """Build graph for simple item."""
-        db = get_recipe_database()
         # Iron Ingot depends on Iron Ore
-        node = db.build_dependency_graph(1101, max_depth=2)
+        node = iron_ingot_graph
         assert node.item_id == 1101
         assert node.item_name == "iron-ingot"
         assert len(node.dependencies) == 1
         assert node.dependencies[0].item_id == 1001  # Iron Ore
 
-    def test_build_dependency_graph_raw_resource(self):
+    def test_build_dependency_graph_raw_resource(self, db):
         """Raw resource has no dependencies."""
-        db = get_recipe_database()
         node = db.build_dependency_graph(1001, max_depth=5)  # Iron Ore
         assert node.item_id == 1001
         assert node.is_raw_resource is True
         assert len(node.dependencies) == 0
 
-    def test_trace_upstream(self):
+    def test_trace_upstream(self, iron_ingot_upstream):
         """Trace upstream dependencies."""
-        db = get_recipe_database()
-        # Trace upstream from Iron Ingot
-        upstream = db.trace_bottleneck_upstream(1101, max_depth=2)
+        upstream = iron_ingot_upstream
         assert len(upstream) >= 1
         # Should include Iron Ingot itself
         item_ids = [item_id for item_id, _, _ in upstream]
         assert 1101 in item_ids
 
-    def test_trace_downstream(self):
+    def test_trace_downstream(self, iron_ingot_downstream):
         """Trace downstream dependents."""
-        db = get_recipe_database()
-        # Trace downstream from Iron Ingot
-        downstream = db.trace_bottleneck_downstream(1101, max_depth=3)
         # Iron Ingot is used in many recipes (gears, circuits, etc.)
-        assert len(downstream) >= 1
+        assert len(iron_ingot_downstream) >= 1
 
-    def test_get_production_chain(self):
+    def test_trace_results_are_cached_copies(self, db):
+        """Repeated traces reuse the cached walk but return fresh lists."""
+        first = db.trace_bottleneck_downstream(1101, max_depth=3)
+        first.clear()
+        second = db.trace_bottleneck_downstream(1101, max_depth=3)
+        assert len(second) >= 1
+        assert (1101, 3) in db._downstream_cache
+
+        upstream = db.trace_bottleneck_upstream(1101, max_depth=2)
+        assert db.trace_bottleneck_upstream(1101, max_depth=2) == upstream
+
+    def test_get_production_chain(self, iron_ingot_chain):
         """Get complete production chain."""
-        db = get_recipe_database()
-        chain = db.get_production_chain(1101)  # Iron Ingot
+        chain = iron_ingot_chain
         assert "target" in chain
         assert chain["target"]["item_id"] == 1101
         assert "steps" in chain
         assert "raw_resources" in chain
 
+    def test_get_production_chain_cached(self, db):
+        """Repeated chains reuse the cached walk but return independent copies."""
+        first = db.get_production_chain(1101)
+        expected = db.get_production_chain(1101)
+        first["steps"][0]["inputs"].clear()
+        first["steps"].clear()
+        first["raw_resources"].clear()
+
+        second = db.get_production_chain(1101)
+        assert second == expected
+        assert second["steps"][0]["inputs"]
+        assert second["raw_resources"]
+        assert 1101 in db._chain_cache
+
 
 class TestRecipeDataclasses:
     """Tests for Recipe dataclasses."""
 
-    def test_recipe_input(self):
-        """RecipeInput dataclass works."""
-        inp = RecipeInput(item_id=1001, count=2, item_name="Iron Ore")
-        assert inp.item_id == 1001
-        assert inp.count == 2
-        assert inp.item_name == "Iron Ore"
-
-    def test_recipe_output(self):
-        """RecipeOutput dataclass works."""
-        out = RecipeOutput(item_id=1101, count=1, item_name="Iron Ingot")
-        assert out.item_id == 1101
-        assert out.count == 1
+    @pytest.mark.parametrize("cls,kwargs,checks", [
+        (
+            RecipeInput,
+            dict(item_id=1001, count=2, item_name="Iron Ore"),
+            {"item_id": 1001, "count": 2, "item_name": "Iron Ore"},
+        ),
+        (
+            RecipeOutput,
+            dict(item_id=1101, count=1, item_name="Iron Ingot"),
+            {"item_id": 1101, "count": 1},
+        ),
+        (
+            DependencyNode,
+            dict(item_id=1001, item_name="Iron Ore", is_raw_resource=True),
+            {"item_id": 1001, "is_raw_resource": True, "dependencies": [], "dependents": []},
+        ),
+    ], ids=["recipe_input", "recipe_output", "dependency_node"])
+    def test_dataclass_fields(self, cls, kwargs, checks):
+        """Recipe dataclasses store their fields."""
+        obj = cls(**kwargs)
+        for attr, value in checks.items():
+            assert getattr(obj, attr) == value
 
     def test_recipe_zero_time(self):
         """Recipe with zero time returns 0 rate."""
@@ -204,14 +262,18 @@ class TestRecipeDataclasses:
         assert recipe.items_per_minute() == 0
         assert recipe.input_requirements_per_minute() == {}
 
-    def test_dependency_node(self):
-        """DependencyNode dataclass works."""
-        node = DependencyNode(
-            item_id=1001,
-            item_name="Iron Ore",
-            is_raw_resource=True,
-        )
-        assert node.item_id == 1001
-        assert node.is_raw_resource is True
-        assert len(node.dependencies) == 0
-        assert len(node.dependents) == 0
+    def test_dataclasses_use_slots(self):
+        """Recipe dataclasses have no per-instance __dict__."""
+        for obj in (
+            RecipeInput(item_id=1001, count=1),
+            RecipeOutput(item_id=1101, count=1),
+            DependencyNode(item_id=1001, item_name="Iron Ore"),
+        ):
+            assert not hasattr(obj, "__dict__")
+
+    def test_building_names_are_shared(self, db):
+        """Recipes built by the same building type share one string."""
+        buildings = {}
+        for recipe in db._recipes.values():
+            first = buildings.setdefault(recipe.building, recipe.building)
+            assert first is recipe.building
@@ -1,15 +1,23 @@
 """Tests for SaveFileParser."""
 
+import asyncio
+import os
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, patch, mock_open
-import sys
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from unittest.mock import MagicMock, patch
 
 from mcp_server.data_sources.save_parser import SaveFileParser
 
+SAVE_HEADER = SaveFileParser.SAVE_MAGIC
+
+
+@pytest.fixture(autouse=True)
+def reset_detected_save_dir():
+    """Keep the process-wide save directory detection from leaking between tests."""
+    SaveFileParser._detected = None
+    yield
+    SaveFileParser._detected = None
+
 
 class TestSaveFileParser:
     """Tests for SaveFileParser class."""
@@ -25,7 +33,16 @@ class TestSaveFileParser:
             parser = SaveFileParser(auto_detect_path=True)
             assert parser.save_dir is None
 
-    @pytest.mark.asyncio
+    def test_detect_save_directory_is_cached(self, tmp_path):
+        """Detection result is reused by later parsers."""
+        with patch.object(SaveFileParser, '_save_dir_candidates', return_value=[tmp_path]) as candidates:
+            first = SaveFileParser(auto_detect_path=True)
+            second = SaveFileParser(auto_detect_path=True)
+
+        assert first.save_dir == tmp_path
+        assert second.save_dir == tmp_path
+        assert candidates.call_count == 1
+
     async def test_parse_file_not_found(self):
         """parse_file raises FileNotFoundError for missing file."""
         parser = SaveFileParser(auto_detect_path=False)
@@ -33,7 +50,6 @@ class TestSaveFileParser:
         with pytest.raises(FileNotFoundError):
             await parser.parse_file("/nonexistent/path/save.dsv")
 
-    @pytest.mark.asyncio
     async def test_parse_file_wrong_extension(self, tmp_path):
         """parse_file raises ValueError for non-.dsv files."""
         # Create a temp file with wrong extension
@@ -45,7 +61,6 @@ class TestSaveFileParser:
         with pytest.raises(ValueError, match="expected .dsv"):
             await parser.parse_file(str(wrong_file))
 
-    @pytest.mark.asyncio
     async def test_get_latest_state_no_directory(self):
         """get_latest_state raises FileNotFoundError when no save dir."""
         parser = SaveFileParser(auto_detect_path=False)
@@ -53,7 +68,6 @@ class TestSaveFileParser:
         with pytest.raises(FileNotFoundError, match="save directory not found"):
             await parser.get_latest_state()
 
-    @pytest.mark.asyncio
     async def test_get_latest_state_no_files(self, tmp_path):
         """get_latest_state raises FileNotFoundError when no save files."""
         parser = SaveFileParser(auto_detect_path=False)
@@ -62,6 +76,29 @@ class TestSaveFileParser:
         with pytest.raises(FileNotFoundError, match="No save files found"):
             await parser.get_latest_state()
 
+    async def test_get_latest_state_missing_directory(self, tmp_path):
+        """A save dir that no longer exists raises FileNotFoundError."""
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path / "missing"
+
+        with pytest.raises(FileNotFoundError, match="save directory not found"):
+            await parser.get_latest_state()
+
+    async def test_get_latest_state_picks_newest(self, tmp_path):
+        """get_latest_state parses the most recently modified save."""
+        old, new = tmp_path / "old.dsv", tmp_path / "new.dsv"
+        old.write_bytes(b"x")
+        new.write_bytes(b"x")
+        os.utime(old, (1, 1))
+        os.utime(new, (2, 2))
+
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path
+        with patch.object(parser, "parse_file") as parse_file:
+            await parser.get_latest_state()
+
+        parse_file.assert_called_once_with(str(new))
+
     def test_list_save_files_no_directory(self):
         """list_save_files returns empty list when no save dir."""
         parser = SaveFileParser(auto_detect_path=False)
@@ -90,6 +127,162 @@ class TestSaveFileParser:
         assert all("size_mb" in f for f in files)
         assert all("modified" in f for f in files)
 
+    def test_list_save_files_reuses_recent_scan(self, tmp_path):
+        """list_save_files reuses a scan within LIST_TTL_MS."""
+        (tmp_path / "save1.dsv").write_bytes(b"x")
+
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path
+        assert len(parser.list_save_files()) == 1
+
+        (tmp_path / "save2.dsv").write_bytes(b"x")
+        assert len(parser.list_save_files()) == 1
+
+        parser.invalidate_cache()
+        assert len(parser.list_save_files()) == 2
+
+    def test_list_save_files_reuses_listing(self, tmp_path):
+        """Listings built from the same scan reuse the cached result."""
+        (tmp_path / "save1.dsv").write_bytes(b"x")
+
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path
+        first = parser.list_save_files()
+        second = parser.list_save_files()
+        assert second == first
+        assert second is not first
+        assert second[0] is first[0]
+
+        parser._scan_cache = None  # expire the scan TTL
+        (tmp_path / "save2.dsv").write_bytes(b"x")
+        assert len(parser.list_save_files()) == 2
+
+    def test_list_save_files_missing_directory(self, tmp_path):
+        """A save dir that no longer exists lists no files."""
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path / "missing"
+        assert parser.list_save_files() == []
+
+    def test_list_save_files_skips_rescan(self, tmp_path):
+        """A repeated listing of an unchanged directory does not rescan it."""
+        (tmp_path / "save1.dsv").write_bytes(b"x")
+
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            parser.list_save_files()
+            parser.list_save_files()
+
+        assert scandir.call_count == 1
+
+    def test_count_save_files(self, tmp_path):
+        """count_save_files counts .dsv files and tracks directory changes."""
+        (tmp_path / "save1.dsv").write_bytes(b"x")
+        (tmp_path / "notes.txt").write_text("ignore me")
+
+        os.utime(tmp_path, ns=(0, 0))  # make the next change visible in mtime
+
+        parser = SaveFileParser(auto_detect_path=False)
+        parser.save_dir = tmp_path
+        assert parser.count_save_files() == 1
+
+        # A save landing right after the scan is counted, not hidden by it
+        (tmp_path / "save2.dsv").write_bytes(b"x")
+        assert parser.count_save_files() == 2
+
+    def test_count_save_files_no_directory(self):
+        """count_save_files returns 0 when no save dir."""
+        parser = SaveFileParser(auto_detect_path=False)
+        assert parser.count_save_files() == 0
+
+
+class TestSaveFileParserCache:
+    """Tests for SaveFileParser parse caching."""
+
+    @pytest.fixture
+    def counting_parser(self):
+        """Parser whose GameSave parsing is stubbed out and counted."""
+        parser = SaveFileParser(auto_detect_path=False)
+        parser._game_save_class = MagicMock()
+        parser.parse_calls = 0
+
+        def fake_parse(game_save_class, path):
+            parser.parse_calls += 1
+            game_save = MagicMock()
+            game_save.gameData.factories = []
+            return game_save
+
+        parser._parse_game_save = fake_parse
+        return parser
+
+    async def test_unchanged_file_is_cached(self, counting_parser, tmp_path):
+        """Parsing an unchanged file twice only parses once."""
+        save = tmp_path / "save.dsv"
+        save.write_bytes(SAVE_HEADER + b"x" * 100)
+
+        first = await counting_parser.parse_file(str(save))
+        second = await counting_parser.parse_file(str(save))
+
+        assert first is second
+        assert counting_parser.parse_calls == 1
+
+    async def test_modified_file_is_reparsed(self, counting_parser, tmp_path):
+        """A change in size invalidates the cached result."""
+        save = tmp_path / "save.dsv"
+        save.write_bytes(SAVE_HEADER + b"x" * 100)
+        await counting_parser.parse_file(str(save))
+
+        save.write_bytes(SAVE_HEADER + b"x" * 200)
+        await counting_parser.parse_file(str(save))
+
+        assert counting_parser.parse_calls == 2
+
+    async def test_concurrent_parses_are_shared(self, counting_parser, tmp_path):
+        """Concurrent requests for the same file share one parse."""
+        save = tmp_path / "save.dsv"
+        save.write_bytes(SAVE_HEADER + b"x" * 100)
+
+        first, second = await asyncio.gather(
+            counting_parser.parse_file(str(save)),
+            counting_parser.parse_file(str(save)),
+        )
+
+        assert first is second
+        assert counting_parser.parse_calls == 1
+        assert counting_parser._inflight == {}
+
+    async def test_truncated_header_is_rejected(self, counting_parser, tmp_path):
+        """Files too short to hold the header are rejected."""
+        save = tmp_path / "save.dsv"
+        save.write_bytes(SAVE_HEADER)
+
+        with pytest.raises(ValueError, match="bad header"):
+            await counting_parser.parse_file(str(save))
+        assert counting_parser.parse_calls == 0
+
+    async def test_bad_magic_is_rejected_before_parsing(self, counting_parser, tmp_path):
+        """Files without the save header fail fast without a full parse."""
+        save = tmp_path / "save.dsv"
+        save.write_bytes(b"NOTSAVE" + b"x" * 100)
+
+        with patch.object(counting_parser, "_get_game_save_class") as get_class:
+            with pytest.raises(ValueError, match="bad header"):
+                await counting_parser.parse_file(str(save))
+
+        get_class.assert_not_called()
+        assert counting_parser.parse_calls == 0
+
+    async def test_invalidate_cache(self, counting_parser, tmp_path):
+        """invalidate_cache forces a re-parse."""
+        save = tmp_path / "save.dsv"
+        save.write_bytes(SAVE_HEADER + b"x" * 100)
+        await counting_parser.parse_file(str(save))
+
+        counting_parser.invalidate_cache()
+        await counting_parser.parse_file(str(save))
+
+        assert counting_parser.parse_calls == 2
+
 
 class TestSaveFileParserIntegration:
     """Integration tests requiring the dsp_save_parser library."""
@@ -103,7 +296,19 @@ class TestSaveFileParserIntegration:
         assert game_save_class is not None
         assert hasattr(game_save_class, 'parse')
 
-    @pytest.mark.asyncio
+    def test_game_save_import_is_shared(self):
+        """GameSave is imported once and shared across parser instances."""
+        from mcp_server.data_sources import save_parser
+
+        save_parser._import_game_save.cache_clear()
+        classes = {
+            SaveFileParser(auto_detect_path=False)._get_game_save_class()
+            for _ in range(100)
+        }
+
+        assert len(classes) == 1
+        assert save_parser._import_game_save.cache_info().misses == 1
+
     async def test_parse_minimal_dsv(self, tmp_path):
         """
         Test parsing a minimal .dsv file structure.
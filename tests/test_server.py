@@ -0,0 +1,165 @@
+"""Tests for MCP server helpers."""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from mcp_server import server
+from mcp_server.data_sources.realtime_stream import RealTimeStream
+from mcp_server.data_sources.router import DataSourceMode, DataSourceRouter
+from mcp_server.models.factory_state import FactoryState
+
+
+class IdleWebSocket:
+    """Connection stand-in that never delivers a frame."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(10)
+        raise StopAsyncIteration
+
+
+@pytest.fixture(autouse=True)
+def clear_state_cache():
+    """Keep cached factory states from leaking between tests."""
+    server._state_cache.clear()
+    yield
+    server._state_cache.clear()
+
+
+@pytest.fixture
+def fetch():
+    """Router fetch stubbed to return a fresh save-file state per call."""
+    async def fake_fetch(**kwargs):
+        await asyncio.sleep(0.01)
+        return FactoryState(timestamp=datetime.now()), DataSourceMode.SAVE_FILE
+
+    with patch.object(
+        server.router, "get_factory_state_with_source", side_effect=fake_fetch
+    ) as fetch:
+        yield fetch
+
+
+class TestStateCache:
+    """Tests for the short-lived factory state cache."""
+
+    async def test_state_is_reused_within_ttl(self, fetch):
+        """A second call within STATE_CACHE_TTL reuses the fetched state."""
+        first, source = await server._get_factory_state()
+        second, _ = await server._get_factory_state()
+
+        assert second is first
+        assert source == "save file"
+        assert fetch.call_count == 1
+
+    async def test_state_is_refetched_after_ttl(self, fetch):
+        """An expired entry is fetched again."""
+        first, _ = await server._get_factory_state()
+        with patch.object(server, "STATE_CACHE_TTL", 0):
+            second, _ = await server._get_factory_state()
+
+        assert second is not first
+        assert fetch.call_count == 2
+
+    async def test_concurrent_calls_share_one_fetch(self, fetch):
+        """Callers waiting on the fetch lock reuse the state it fetched."""
+        results = await asyncio.gather(*(server._get_factory_state() for _ in range(5)))
+
+        assert fetch.call_count == 1
+        assert all(state is results[0][0] for state, _ in results)
+
+    async def test_modes_are_cached_separately(self, fetch):
+        """A forced real-time request does not reuse a best-source state."""
+        await server._get_factory_state()
+        await server._get_factory_state(force_realtime=True)
+
+        assert fetch.call_count == 2
+        assert fetch.call_args.kwargs["force_mode"] is DataSourceMode.REALTIME
+
+    async def test_require_fresh_bypasses_cache(self, fetch):
+        """require_fresh always fetches and never fills the cache."""
+        cached, _ = await server._get_factory_state()
+        fresh, _ = await server._get_factory_state(require_fresh=True)
+
+        assert fresh is not cached
+        assert fetch.call_count == 2
+        assert fetch.call_args.kwargs["require_fresh"] is True
+        assert (await server._get_factory_state())[0] is cached
+
+
+class TestRouterRequireFresh:
+    """Tests for DataSourceRouter.get_factory_state_with_source()."""
+
+    async def test_require_fresh_waits_for_fresh_state(self):
+        """require_fresh is passed through to the real-time stream."""
+        router = DataSourceRouter()
+        state = FactoryState(timestamp=datetime.now())
+        stream = router.realtime_stream
+
+        wait = AsyncMock(return_value=state)
+        with patch.object(stream, "is_connected", return_value=True):
+            with patch.object(stream, "wait_for_fresh_state", wait):
+                result, mode = await router.get_factory_state_with_source(
+                    force_mode=DataSourceMode.REALTIME, require_fresh=True, max_age_ms=250
+                )
+
+        assert result is state
+        assert mode is DataSourceMode.REALTIME
+        wait.assert_awaited_once_with(max_age_ms=250)
+
+
+class TestConnectToGame:
+    """Tests for the connect_to_game tool."""
+
+    @pytest.fixture
+    async def stream(self, monkeypatch):
+        """A connected stream in place of the router's, closed afterwards."""
+        stream = RealTimeStream()
+        stream.POOL_SIZE = 1  # don't open standbys
+        stream.websocket = IdleWebSocket()
+        stream._connected = True
+        stream._receive_task = asyncio.create_task(stream._receive_loop())
+        stream.latest_state = FactoryState(timestamp=datetime.now())
+        stream._last_message_time = time.monotonic()
+        monkeypatch.setattr(server.router, "realtime_stream", stream)
+        yield stream
+        await stream.close()
+
+    async def test_new_address_reconnects(self, stream, fetch):
+        """A different address drops the old connection and connects anew."""
+        old = stream.websocket
+        await server._get_factory_state()
+        new = IdleWebSocket()
+
+        with patch.object(stream, "_open_connection", return_value=new) as open_connection:
+            result = await server.connect_to_game(host="10.0.0.2", port=9000)
+
+        assert result["status"] == "connected"
+        open_connection.assert_called_once()
+        assert old.closed
+        assert stream.websocket is new
+        assert stream.uri == "ws://10.0.0.2:9000"
+        assert stream.latest_state is None
+        assert server._state_cache == {}
+
+    async def test_same_address_keeps_connection(self, stream):
+        """Connecting to the current address reuses the live connection."""
+        old = stream.websocket
+
+        with patch.object(stream, "_open_connection") as open_connection:
+            result = await server.connect_to_game(host=stream.host, port=stream.port)
+
+        assert result["status"] == "connected"
+        open_connection.assert_not_called()
+        assert stream.websocket is old
+        assert not old.closed